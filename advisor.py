@@ -0,0 +1,181 @@
+# ====================================
+# Conselheiro de compra por busca expectimax
+# ====================================
+# Avalia "comprar ou passar" olhando alguns turnos à frente sobre o GameState:
+# nós de acaso sobre as 11 somas dos dados (2 a 12, com suas probabilidades),
+# nós de decisão nas ofertas de compra (o jogador aconselhado maximiza, os
+# adversários minimizam) e, nas folhas, o patrimônio mais a renda esperada das
+# casas. Os valores já calculados ficam em uma tabela de transposição com
+# descarte LRU, e o aprofundamento é iterativo: uma nova profundidade só começa
+# se a estimativa do seu custo couber no tempo que resta dos 50 ms.
+
+import argparse
+import gc
+import time
+from collections import OrderedDict, namedtuple
+
+from app import Game, PurchasePolicy, build_default_board, expected_income
+from state import GameState, tables_for
+
+DICE_PROBABILITIES = [(total, (6 - abs(total - 7)) / 36) for total in range(2, 13)]
+WIN_SCORE = 1e9
+UNWIND_RESERVE = 0.001  # Segundos reservados para desempilhar uma busca interrompida e montar a resposta
+GROWTH = 11.0  # Crescimento estimado de uma profundidade para a seguinte enquanto não há medida (11 somas por nó)
+
+Recommendation = namedtuple("Recommendation", ["buy", "buy_value", "pass_value", "depth", "nodes", "elapsed"])
+
+class SearchTimeout(Exception):
+    pass
+
+class PurchaseAdvisor:
+    def __init__(self, board, starting_bonus: int = 100, time_budget: float = 0.05, income_horizon: int = 20,
+                 table_size: int = 200000, max_depth: int = 8):
+        self.tables = tables_for(board)
+        self.time_budget = time_budget
+        self.income_horizon = income_horizon  # Turnos de cada adversário considerados na renda das casas
+        self.table_size = table_size
+        self.max_depth = max_depth
+        self.table = OrderedDict()  # Tabela de transposição: chave do estado -> valor
+        self.income = expected_income(board, starting_bonus)  # Renda por turno de adversário de cada casa
+        self.deadline = 0.0
+        self.nodes = 0
+
+    def value(self, state: GameState, player: int):
+        price, income = self.tables.price, self.income
+        weight = self.income_horizon * (len(state.alive) - 1)
+        return state.balance[player] + sum(price[i] + weight * income[i] for i in state.holdings[player])
+
+    # Vantagem do jogador aconselhado sobre o melhor adversário
+    def evaluate(self, state: GameState, root: int):
+        if root not in state.alive:
+            return -WIN_SCORE
+        if not state.active:
+            return WIN_SCORE
+        return self.value(state, root) - max(self.value(state, p) for p in state.alive if p != root)
+
+    def key(self, state: GameState, root: int, depth: int):
+        n = self.tables.num_spaces
+        # A posição módulo o tabuleiro basta: o bônus de volta depende só de cruzar a partida
+        return (tuple(p % n for p in state.position), state.balance, state.owner, state.alive, state.current,
+                root, depth)
+
+    # Valor esperado antes da rolagem dos dados (nó de acaso)
+    def chance(self, state: GameState, root: int, depth: int):
+        if depth == 0 or not state.active:
+            return self.evaluate(state, root)
+        key = self.key(state, root, depth)
+        table = self.table
+        cached = table.get(key)
+        if cached is not None:
+            table.move_to_end(key)
+            return cached
+        self.nodes += 1
+        if time.perf_counter() > self.deadline:
+            raise SearchTimeout()
+        player = state.current_player
+        total_value = 0.0
+        deadline = self.deadline
+        for total, probability in DICE_PROBABILITIES:
+            if time.perf_counter() > deadline:  # Também entre os filhos: um nó raso ainda expande 11 somas
+                raise SearchTimeout()
+            dice_values = (total, 0)  # apply só usa a soma
+            if state.offers_purchase(total):
+                space = state.landing(total)
+                bought = state.apply(dice_values, True)
+                value = self.chance(bought, root, depth - 1)
+                if bought.owner[space] == player:  # Só há escolha se o saldo permitiu a compra
+                    passed = self.chance(state.apply(dice_values, False), root, depth - 1)
+                    value = max(value, passed) if player == root else min(value, passed)
+            else:
+                value = self.chance(state.apply(dice_values), root, depth - 1)
+            total_value += probability * value
+        table[key] = total_value
+        if len(table) > self.table_size:
+            table.popitem(last=False)
+        return total_value
+
+    # Decide a compra de uma casa no estado do meio do turno (jogador já parado nela);
+    # started é o início da decisão (advise), para que o orçamento inclua a montagem do estado
+    def recommend(self, state: GameState, space: int, started: float = None):
+        started = started or time.perf_counter()
+        self.deadline = started + self.time_budget - UNWIND_RESERVE
+        self.nodes = 0
+        root = state.current_player
+        bought, passed = state.resolve_purchase(space, True), state.resolve_purchase(space, False)
+        result = (self.evaluate(bought, root), self.evaluate(passed, root), 0)  # Última profundidade completa
+        # Uma coleta completa do gc percorreria a tabela de transposição inteira no meio da busca
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            # Custo da próxima profundidade = tempo de CPU da última (sem as pausas do escalonador)
+            # vezes o crescimento do número de nós expandidos entre as duas últimas
+            cost, expanded, growth = None, 0, GROWTH
+            for depth in range(1, self.max_depth + 1):
+                if cost is not None and time.perf_counter() + cost * growth > self.deadline:
+                    break  # A próxima profundidade não terminaria a tempo
+                nodes, cpu_started = self.nodes, time.process_time()
+                try:
+                    result = (self.chance(bought, root, depth), self.chance(passed, root, depth), depth)
+                except SearchTimeout:
+                    break
+                cost = time.process_time() - cpu_started
+                if expanded and self.nodes > nodes:
+                    growth = max((self.nodes - nodes) / expanded, 1.0)
+                expanded = self.nodes - nodes
+        finally:
+            if gc_enabled:
+                gc.enable()
+        buy_value, pass_value, depth = result
+        return Recommendation(buy_value >= pass_value, buy_value, pass_value, depth, self.nodes,
+                              time.perf_counter() - started)
+
+    def advise(self, game: Game, space):
+        started = time.perf_counter()
+        return self.recommend(GameState.from_game(game), game.board.index_of(space), started)
+
+    # Para usar direto como Game.purchase_callback
+    def callback(self, game: Game):
+        return lambda player, space: self.advise(game, space).buy
+
+# Política de compra baseada no conselheiro; recria o conselheiro quando o tabuleiro muda
+class ExpectimaxPolicy(PurchasePolicy):
+    def __init__(self, time_budget: float = 0.05, income_horizon: int = 20):
+        self.time_budget = time_budget
+        self.income_horizon = income_horizon
+        self.advisor = None
+        self.board = None
+
+    def should_buy(self, player, space, game):
+        if game.board is not self.board:
+            self.board = game.board
+            self.advisor = PurchaseAdvisor(game.board, game.starting_bonus, self.time_budget, self.income_horizon)
+        return self.advisor.advise(game, space).buy
+
+def main():
+    from simulation import HeadlessRunner, make_players
+    parser = argparse.ArgumentParser(description="Conselheiro de compra por expectimax.")
+    parser.add_argument("--games", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--budget", type=float, default=0.05, help="tempo por decisão, em segundos")
+    parser.add_argument("--max-turns", type=int, default=300)
+    args = parser.parse_args()
+    timings, depths = [], []
+    for game_index in range(args.games):
+        game = Game(build_default_board(), make_players(2), seed=args.seed + game_index)
+        advisor = PurchaseAdvisor(game.board, game.starting_bonus, args.budget)
+        runner = HeadlessRunner(game, max_turns=args.max_turns)
+
+        def decide(player, space):
+            recommendation = advisor.advise(game, space)
+            timings.append(recommendation.elapsed)
+            depths.append(recommendation.depth)
+            return recommendation.buy
+        game.purchase_callback = decide
+        result = runner.run()
+        print(f"Partida {game_index + 1}: vencedor {result.winner}, {result.turns} turnos")
+    timings.sort()
+    print(f"Decisões: {len(timings)}; tempo máximo {timings[-1] * 1000:.1f} ms, "
+          f"mediano {timings[len(timings) // 2] * 1000:.1f} ms; profundidade média {sum(depths) / len(depths):.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,35 @@
+import os
 import random
 import math
-import tkinter as tk
-from tkinter import messagebox
-from tkinter.scrolledtext import ScrolledText
+import time
+import weakref
+from functools import lru_cache
+from itertools import islice
 from abc import ABC, abstractmethod
 
+from events import (AssetsReleased, BonusReceived, DiceRolled, Eliminated, EventBus, GameStarted, InsufficientFunds,
+                    LandedOnOwnSpace, LandedOnSpace, Message, Moved, PassedStart, PenaltyApplied, Purchased,
+                    PurchaseDeclined, RentDue, RentPaid, RingBufferSink, StdoutSink, TurnStarted, Won)
+
+# tkinter só é importado quando a interface gráfica é de fato usada,
+# assim as simulações sem interface (headless) iniciam rápido.
+tk = None
+messagebox = None
+
+def load_tkinter():
+    global tk, messagebox
+    if tk is None:
+        import tkinter
+        from tkinter import messagebox as tk_messagebox
+        tk, messagebox = tkinter, tk_messagebox
+
 # ====================================
 # Padrão Observer
 # ====================================
 
 class Observer(ABC):
     @abstractmethod
-    def update(self, event: str):
+    def update(self, event):
         pass
 
 # ====================================
@@ -19,9 +37,13 @@ class Observer(ABC):
 # ====================================
 
 # Classe base para os logradouros (polimorfismo)
+# __slots__ evita um __dict__ por casa, o que importa em tabuleiros com milhões de casas
 class Space(ABC):
+    __slots__ = ('name', 'index')
+
     def __init__(self, name: str):
         self.name = name
+        self.index = None  # Posição no tabuleiro, definida pelo Board
 
     @abstractmethod
     def landed_on(self, player, dice_values, game):
@@ -29,6 +51,9 @@ class Space(ABC):
 
 # Imóvel: pode ser adquirido e rende aluguel
 class Property(Space):
+    __slots__ = ('price', 'rent', 'owner')
+    kind = 'property'
+
     def __init__(self, name: str, price: int, rent: int):
         super().__init__(name)
         self.price = price
@@ -37,17 +62,22 @@ class Property(Space):
 
     def landed_on(self, player, dice_values, game):
         if self.owner is None:
-            game.log_event(f"{player.name} caiu em {self.name} (Imóvel). Preço: {self.price}, Aluguel: {self.rent}.")
+            game.emit(LandedOnSpace, player, self)
             game.offer_purchase(player, self)
         elif self.owner != player:
-            game.log_event(f"{player.name} caiu em {self.name}, que pertence a {self.owner.name}. Deve pagar aluguel de {self.rent}.")
-            if not player.pay(self.rent, self.owner):
+            game.emit(RentDue, player, self, self.owner, self.rent)
+            if player.pay(self.rent, self.owner):
+                game.emit(RentPaid, player, self.owner, self, self.rent)
+            else:
                 game.eliminate_player(player)
         else:
-            game.log_event(f"{player.name} caiu em seu próprio imóvel {self.name}.")
+            game.emit(LandedOnOwnSpace, player, self)
 
 # Empresa: pode ser adquirida e rende taxa de uso (Strategy)
 class Company(Space):
+    __slots__ = ('price', 'base_fee', 'owner', 'fee_strategy')
+    kind = 'company'
+
     def __init__(self, name: str, price: int, base_fee: int, fee_strategy):
         super().__init__(name)
         self.price = price
@@ -57,24 +87,29 @@ class Company(Space):
 
     def landed_on(self, player, dice_values, game):
         if self.owner is None:
-            game.log_event(f"{player.name} caiu na {self.name} (Empresa). Preço: {self.price}, Taxa Base: {self.base_fee}.")
+            game.emit(LandedOnSpace, player, self)
             game.offer_purchase(player, self)
         elif self.owner != player:
             fee = self.fee_strategy.calculate_fee(self, dice_values)
-            game.log_event(f"{player.name} caiu na {self.name}, que pertence a {self.owner.name}. Deve pagar taxa de {fee}.")
-            if not player.pay(fee, self.owner):
+            game.emit(RentDue, player, self, self.owner, fee)
+            if player.pay(fee, self.owner):
+                game.emit(RentPaid, player, self.owner, self, fee)
+            else:
                 game.eliminate_player(player)
         else:
-            game.log_event(f"{player.name} caiu em sua própria empresa {self.name}.")
+            game.emit(LandedOnOwnSpace, player, self)
 
 # Lugar Especial: não pode ser adquirido e possui efeito especial
 class SpecialPlace(Space):
+    __slots__ = ('effect',)
+    kind = 'special'
+
     def __init__(self, name: str, effect):
         super().__init__(name)
         self.effect = effect
 
     def landed_on(self, player, dice_values, game):
-        game.log_event(f"{player.name} caiu em {self.name} (Lugar Especial).")
+        game.emit(LandedOnSpace, player, self)
         self.effect(player, game)
 
 # ====================================
@@ -82,18 +117,112 @@ class SpecialPlace(Space):
 # ====================================
 
 class FeeStrategy(ABC):
+    __slots__ = ()
+
     @abstractmethod
     def calculate_fee(self, company, dice_values):
         pass
 
 class FixedFeeStrategy(FeeStrategy):
+    __slots__ = ()
+
     def calculate_fee(self, company, dice_values):
         return company.base_fee
 
 class VariableFeeStrategy(FeeStrategy):
+    __slots__ = ()
+
     def calculate_fee(self, company, dice_values):
         return company.base_fee * sum(dice_values)
 
+# As estratégias não têm estado: todas as empresas compartilham as mesmas instâncias (flyweight)
+FEE_STRATEGIES = {'fixed': FixedFeeStrategy(), 'variable': VariableFeeStrategy()}
+
+def fee_strategy_name(strategy: FeeStrategy):
+    return 'variable' if isinstance(strategy, VariableFeeStrategy) else 'fixed'
+
+# ====================================
+# Padrão Strategy – Decisão de Compra
+# ====================================
+
+class PurchasePolicy(ABC):
+    @abstractmethod
+    def should_buy(self, player, space, game):
+        pass
+
+# Comportamento padrão do jogo quando não há callback: sempre tenta comprar
+class AlwaysBuyPolicy(PurchasePolicy):
+    def should_buy(self, player, space, game):
+        return True
+
+class NeverBuyPolicy(PurchasePolicy):
+    def should_buy(self, player, space, game):
+        return False
+
+# Compra com uma probabilidade fixa, usando o gerador do simulador
+class RandomBuyPolicy(PurchasePolicy):
+    def __init__(self, probability: float = 0.5, rng=None):
+        self.probability = probability
+        self.rng = rng or random.Random()
+
+    def should_buy(self, player, space, game):
+        return self.rng.random() < self.probability
+
+# Compra apenas se o preço não passar de uma fração do saldo atual
+class ThresholdPolicy(PurchasePolicy):
+    def __init__(self, max_fraction: float = 0.5):
+        self.max_fraction = max_fraction
+
+    def should_buy(self, player, space, game):
+        return space.price <= self.max_fraction * player.balance
+
+# Compra apenas se sobrar uma reserva mínima de caixa para pagar aluguéis
+class CashReservePolicy(PurchasePolicy):
+    def __init__(self, reserve: int = 200):
+        self.reserve = reserve
+
+    def should_buy(self, player, space, game):
+        return player.balance - space.price >= self.reserve
+
+# Renda esperada por turno de adversário de cada casa: frequência de parada da cadeia de Markov
+# vezes o aluguel/taxa. Sem NumPy/SciPy aproxima a parada como uniforme e a soma dos dados pela média (7)
+def expected_income(board, starting_bonus: int = 100):
+    try:
+        from markov import analyze_board
+        return [float(value) for value in analyze_board(board, starting_bonus).expected_income]
+    except ImportError:
+        probability = 1 / len(board.spaces)
+        income = []
+        for space in board.spaces:
+            if space.kind == 'property':
+                income.append(probability * space.rent)
+            elif space.kind == 'company':
+                income.append(probability * space.fee_strategy.calculate_fee(space, [3, 4]))
+            else:
+                income.append(0.0)
+        return income
+
+# Compra se a renda esperada dentro do horizonte (expected_income, para cada adversário) pagar o preço
+class ExpectedValuePolicy(PurchasePolicy):
+    def __init__(self, horizon: int = 50, reserve: int = 0):
+        self.horizon = horizon  # Turnos de cada adversário considerados
+        self.reserve = reserve
+        self.income_cache = weakref.WeakKeyDictionary()  # Tabuleiro -> renda esperada por turno de cada casa
+
+    def expected_income(self, game):
+        board = game.board
+        income = self.income_cache.get(board)
+        if income is None:
+            income = self.income_cache[board] = expected_income(board, game.starting_bonus)
+        return income
+
+    def should_buy(self, player, space, game):
+        if player.balance - space.price < self.reserve:
+            return False
+        opponents = len(game.turn_order) - 1
+        income = self.expected_income(game)[game.board.index_of(space)]
+        return income * opponents * self.horizon >= space.price
+
 # ====================================
 # Padrão Factory – Criação dos Espaços
 # ====================================
@@ -105,10 +234,13 @@ class SpaceFactory:
             return Property(kwargs['name'], kwargs['price'], kwargs['rent'])
         elif space_type == 'company':
             fee_strategy_type = kwargs.get('fee_strategy', 'fixed')
-            fee_strategy = FixedFeeStrategy() if fee_strategy_type == 'fixed' else VariableFeeStrategy()
+            fee_strategy = FEE_STRATEGIES['fixed' if fee_strategy_type == 'fixed' else 'variable']
             return Company(kwargs['name'], kwargs['price'], kwargs['base_fee'], fee_strategy)
         elif space_type == 'special':
-            return SpecialPlace(kwargs['name'], kwargs['effect'])
+            effect = kwargs['effect']
+            if isinstance(effect, str):  # Efeito referenciado pelo nome no registro
+                effect = resolve_effect(effect, kwargs.get('steps'))
+            return SpecialPlace(kwargs['name'], effect)
         else:
             raise ValueError("Tipo de logradouro inválido.")
 
@@ -117,6 +249,8 @@ class SpaceFactory:
 # ====================================
 
 class Player:
+    __slots__ = ('name', 'balance', 'properties', 'position')
+
     def __init__(self, name: str, balance: int = 500):
         self.name = name
         self.balance = balance
@@ -145,85 +279,488 @@ class Board:
     def __init__(self, spaces: list):
         self.spaces = spaces
         self.start_position = 0
+        for i, space in enumerate(spaces):
+            space.index = i
 
     def get_space(self, position: int):
         return self.spaces[position % len(self.spaces)]
 
+    def index_of(self, space: Space):
+        return space.index
+
+    # Quantidade de casas adquiríveis de cada tipo (tabuleiros em arrays contam pelas colunas)
+    def kind_totals(self):
+        totals = {}
+        for space in self.spaces:
+            if hasattr(space, 'owner'):
+                totals[space.kind] = totals.get(space.kind, 0) + 1
+        return totals
+
+# ====================================
+# Índice de Posse (quem possui o quê)
+# ====================================
+
+# Mantido por Game.offer_purchase e pela eliminação; todas as consultas são O(1)
+class OwnershipIndex:
+    def __init__(self, board: Board):
+        self.board = board
+        self.owners = [None] * len(board.spaces)  # Índice da casa -> jogador dono
+        self.holdings = {}  # Jogador -> índices das casas que possui
+        self.asset_values = {}  # Jogador -> soma dos preços das casas que possui
+        self.kind_counts = {}  # Jogador -> {tipo: quantidade}
+        self.kind_totals = board.kind_totals()  # Tipo -> quantidade de casas adquiríveis desse tipo no tabuleiro
+        self.owned_total = 0
+
+    def acquire(self, player, space: Space):
+        index = self.board.index_of(space)
+        space.owner = player
+        player.add_property(space)
+        self.owners[index] = player
+        self.holdings.setdefault(player, set()).add(index)
+        self.asset_values[player] = self.asset_values.get(player, 0) + space.price
+        counts = self.kind_counts.setdefault(player, {})
+        counts[space.kind] = counts.get(space.kind, 0) + 1
+        self.owned_total += 1
+
+    # Devolve ao banco tudo o que o jogador possui
+    def release_all(self, player):
+        released = []
+        spaces = self.board.spaces
+        for index in self.holdings.pop(player, ()):
+            space = spaces[index]
+            space.owner = None
+            self.owners[index] = None
+            released.append(space)
+        player.properties = []
+        self.asset_values.pop(player, None)
+        self.kind_counts.pop(player, None)
+        self.owned_total -= len(released)
+        return released
+
+    # Reconstrói o índice a partir de Space.owner (após Game.restore)
+    def rebuild(self):
+        self.owners = [None] * len(self.board.spaces)
+        self.holdings, self.asset_values, self.kind_counts = {}, {}, {}
+        self.owned_total = 0
+        for space in self.board.spaces:
+            owner = getattr(space, 'owner', None)
+            if owner is not None:
+                index = self.board.index_of(space)
+                self.owners[index] = owner
+                self.holdings.setdefault(owner, set()).add(index)
+                self.asset_values[owner] = self.asset_values.get(owner, 0) + space.price
+                counts = self.kind_counts.setdefault(owner, {})
+                counts[space.kind] = counts.get(space.kind, 0) + 1
+                self.owned_total += 1
+
+    def owner(self, index: int):
+        return self.owners[index]
+
+    def count(self, player, kind: str = None):
+        if kind is None:
+            return len(self.holdings.get(player, ()))
+        return self.kind_counts.get(player, {}).get(kind, 0)
+
+    def net_worth(self, player):
+        return player.balance + self.asset_values.get(player, 0)
+
+    # Sem grupos de cor no tabuleiro, o monopólio é possuir todas as casas de um tipo (imóveis ou empresas)
+    def has_monopoly(self, player, kind: str):
+        total = self.kind_totals.get(kind, 0)
+        return total > 0 and self.count(player, kind) == total
+
+    def monopoly_count(self, player):
+        return sum(1 for kind in self.kind_counts.get(player, {}) if self.has_monopoly(player, kind))
+
+# ====================================
+# Ordem dos Turnos (anel dos jogadores vivos)
+# ====================================
+
+# Lista circular duplamente ligada sobre os índices do roster: avançar e eliminar são O(1).
+# O eliminado mantém o seu "próximo", então eliminar o jogador da vez e depois avançar
+# passa a vez para quem vinha logo depois dele, sem pular nem repetir ninguém.
+class TurnOrder:
+    __slots__ = ('next', 'prev', 'alive', 'count', 'current')
+
+    def __init__(self, size: int, alive=None, current: int = 0):
+        members = list(range(size)) if alive is None else sorted(alive)
+        self.next = [0] * size
+        self.prev = [0] * size
+        self.alive = [False] * size
+        for k, i in enumerate(members):
+            self.next[i] = members[(k + 1) % len(members)]
+            self.prev[i] = members[k - 1]
+            self.alive[i] = True
+        # Fora do anel, "próximo" aponta para o primeiro vivo seguinte (ex.: jogador da vez já eliminado)
+        k = 0
+        for i in range(size):
+            if not self.alive[i] and members:
+                while k < len(members) and members[k] < i:
+                    k += 1
+                self.next[i] = members[k % len(members)]
+        self.count = len(members)
+        self.current = current  # Índice no roster do jogador da vez
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, index: int):
+        return self.alive[index]
+
+    # Primeiro jogador vivo depois de index
+    def after(self, index: int):
+        nxt, alive = self.next, self.alive
+        index = nxt[index]
+        while not alive[index]:
+            index = nxt[index]
+        return index
+
+    def advance(self):
+        self.current = self.after(self.current)
+        return self.current
+
+    def remove(self, index: int):
+        if self.alive[index]:
+            self.alive[index] = False
+            self.next[self.prev[index]] = self.next[index]
+            self.prev[self.next[index]] = self.prev[index]
+            self.count -= 1
+
+    def members(self):
+        return tuple(i for i, alive in enumerate(self.alive) if alive)
+
 # ====================================
 # Classe Game (Lógica Central)
 # ====================================
 
 class Game:
-    def __init__(self, board: Board, players: list, starting_bonus: int = 100):
+    def __init__(self, board: Board, players: list, starting_bonus: int = 100, seed: int = None):
         self.board = board
-        self.players = players
-        self.current_player_index = 0
+        self.roster = list(players)  # Todos os jogadores, inclusive os eliminados
+        self.roster_index = {id(p): i for i, p in enumerate(self.roster)}
+        self.turn_order = TurnOrder(len(self.roster))  # Vivos e jogador da vez, por índice no roster
         self.starting_bonus = starting_bonus
         self.active = True
-        self.observers = []  # Para notificação de eventos
+        self.events = EventBus()  # Para notificação de eventos (observers e sinks)
+        # O evento só é criado (e formatado) se algum observer ou sink quiser esse tipo;
+        # emit aponta direto para o barramento para evitar uma chamada extra por evento
+        self.emit = self.events.emit
         self.purchase_callback = None
+        self.ownership = OwnershipIndex(board)
+        self.profiler = None  # profiling.Profiler, anexado com Profiler.attach
+        # Cada jogo tem seu próprio gerador, para que a partida possa ser reproduzida
+        self.seed = seed if seed is not None else random.randrange(1 << 63)
+        self.rng = random.Random(self.seed)
+
+    # Jogadores vivos na ordem do roster; O(n), para relatórios e não para o laço dos turnos
+    @property
+    def players(self):
+        alive = self.turn_order.alive
+        return [player for i, player in enumerate(self.roster) if alive[i]]
+
+    @property
+    def current_player(self):
+        return self.roster[self.turn_order.current]
+
+    @property
+    def winner(self):
+        order = self.turn_order
+        return self.roster[order.after(order.current)] if len(order) == 1 else None
+
+    def is_alive(self, player: Player):
+        return self.turn_order.alive[self.roster_index[id(player)]]
 
-    def add_observer(self, observer: Observer):
-        self.observers.append(observer)
-
-    def log_event(self, event: str):
-        for observer in self.observers:
-            observer.update(event)
-        print(event)
+    def roll_dice(self):
+        return [self.rng.randint(1, 6), self.rng.randint(1, 6)]
+
+    # Estado completo da partida (sem observers), usado pelo replay para pular turnos
+    def snapshot(self):
+        roster_index = self.roster_index
+        owners = tuple(roster_index[id(space.owner)] if getattr(space, 'owner', None) is not None else -1
+                       for space in self.board.spaces)
+        players = tuple((p.position, p.balance, tuple(self.board.index_of(s) for s in p.properties))
+                        for p in self.roster)
+        order = self.turn_order
+        return (order.current, self.active, order.members(), players, owners, self.rng.getstate())
+
+    def restore(self, snapshot):
+        current, active, alive, players, owners, rng_state = snapshot
+        spaces = self.board.spaces
+        for player, (position, balance, properties) in zip(self.roster, players):
+            player.position = position
+            player.balance = balance
+            player.properties = [spaces[i] for i in properties]
+        for space, owner in zip(spaces, owners):
+            if hasattr(space, 'owner'):
+                space.owner = self.roster[owner] if owner >= 0 else None
+        self.turn_order = TurnOrder(len(self.roster), alive, current)
+        self.active = active
+        self.rng.setstate(rng_state)
+        self.ownership.rebuild()
+
+    def add_observer(self, observer: Observer, event_types=None):
+        self.events.subscribe(observer.update, event_types)
+
+    def add_sink(self, sink, event_types=None):
+        self.events.subscribe(sink, event_types)
+
+    def log_event(self, event):
+        self.events.publish(Message(event) if isinstance(event, str) else event)
+
+    def start_turn(self):
+        player = self.roster[self.turn_order.current]
+        self.emit(TurnStarted, player)
+        return player
+
+    # Resolve um turno completo: movimento, bônus de volta, efeito do logradouro e próximo jogador
+    def play_turn(self, player: Player, dice_values):
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.begin('turno')
+            profiler.begin('movimento')
+        steps = sum(dice_values)
+        self.emit(DiceRolled, player, dice_values)
+        num_spaces = len(self.board.spaces)
+        prev_position = player.position
+        player.position += steps
+        if profiler is not None:
+            profiler.end()
+            profiler.begin('bonus_volta')
+        if player.position // num_spaces > prev_position // num_spaces:
+            player.adjust_balance(self.starting_bonus)
+            self.emit(PassedStart, player, self.starting_bonus)
+        if profiler is not None:
+            profiler.end()
+            profiler.begin('landed_on')
+        current_space = self.board.get_space(player.position)
+        current_space.landed_on(player, dice_values, self)
+        if profiler is not None:
+            profiler.end()
+        if self.active:
+            self.turn_order.advance()
+        if profiler is not None:
+            profiler.end()
 
     def offer_purchase(self, player: Player, space: Space):
         if self.purchase_callback:
-            decision = self.purchase_callback(player, space)
+            if self.profiler is not None:
+                self.profiler.begin('decisao_compra')
+                decision = self.purchase_callback(player, space)
+                self.profiler.end()
+            else:
+                decision = self.purchase_callback(player, space)
         else:
             decision = True
         if decision:
             if player.balance >= space.price:
                 player.adjust_balance(-space.price)
-                space.owner = player
-                player.add_property(space)
-                self.log_event(f"{player.name} comprou {space.name} por {space.price}.")
+                self.ownership.acquire(player, space)
+                self.emit(Purchased, player, space)
             else:
-                self.log_event(f"{player.name} não tem saldo suficiente para comprar {space.name}.")
+                self.emit(InsufficientFunds, player, space)
         else:
-            self.log_event(f"{player.name} optou por não comprar {space.name}.")
+            self.emit(PurchaseDeclined, player, space)
 
     def eliminate_player(self, player: Player):
-        self.log_event(f"{player.name} foi eliminado!")
-        if player in self.players:
-            self.players.remove(player)
-        if len(self.players) == 1:
-            self.log_event(f"{self.players[0].name} é o vencedor!")
+        self.emit(Eliminated, player)
+        self.turn_order.remove(self.roster_index[id(player)])
+        released = self.ownership.release_all(player)
+        if released:
+            self.emit(AssetsReleased, player, released)
+        if len(self.turn_order) == 1:
+            self.emit(Won, self.winner)
             self.active = False
 
 # ====================================
 # Efeitos para Lugares Especiais
 # ====================================
 
+BONUS_AMOUNT = 50
+PENALTY_AMOUNT = 50
+
+def no_effect(player: Player, game: Game):
+    pass
+
 def bonus_effect(player: Player, game: Game):
-    bonus = 50
-    game.log_event(f"{player.name} recebe um bônus de {bonus}.")
+    bonus = BONUS_AMOUNT
+    game.emit(BonusReceived, player, bonus)
     player.adjust_balance(bonus)
 
 def penalty_effect(player: Player, game: Game):
-    penalty = 50
-    game.log_event(f"{player.name} sofre uma penalidade de {penalty}.")
+    penalty = PENALTY_AMOUNT
+    game.emit(PenaltyApplied, player, penalty)
     player.adjust_balance(-penalty)
     if player.balance < 0:
          game.eliminate_player(player)
 
+@lru_cache(maxsize=None)  # Mesmo deslocamento, mesma função (flyweight)
 def move_effect(steps: int):
     def effect(player: Player, game: Game):
-        game.log_event(f"{player.name} avança {steps} casa(s).")
+        game.emit(Moved, player, steps)
         player.position += steps
+    effect.steps = steps  # Permite que os motores compilados reconheçam o deslocamento
     return effect
 
+# Registro de efeitos por nome, usado pelos arquivos de tabuleiro
+EFFECTS = {'none': no_effect, 'bonus': bonus_effect, 'penalty': penalty_effect}
+PARAMETRIC_EFFECTS = {'move': move_effect}
+
+def register_effect(name: str, effect):
+    EFFECTS[name] = effect
+
+def resolve_effect(name: str, steps=None):
+    if name in PARAMETRIC_EFFECTS:
+        return PARAMETRIC_EFFECTS[name](int(steps if steps not in (None, '') else 1))
+    try:
+        return EFFECTS[name]
+    except KeyError:
+        raise ValueError(f"Efeito desconhecido: {name}.") from None
+
+# Nome e parâmetro de um efeito, para gravar o tabuleiro em arquivo
+def effect_name(effect):
+    steps = getattr(effect, 'steps', None)
+    if steps is not None:
+        return 'move', steps
+    for name, registered in EFFECTS.items():
+        if registered is effect:
+            return name, None
+    raise ValueError("Efeito não registrado.")
+
 # ====================================
 # Interface Gráfica (Tkinter) – Visualiza Tabuleiro, Logradouros e Animação dos Dados
 # ====================================
 
+# Distribui as casas igualmente pelo perímetro de um quadrado centrado no canvas, a partir do
+# canto superior esquerdo em sentido horário: uma posição por casa, para qualquer tamanho de tabuleiro
+def square_positions(num_spaces: int, canvas_size: int = 500, square_side: int = 400):
+    start = (canvas_size - square_side) / 2
+    positions = []
+    for i in range(num_spaces):
+        distance = i * 4 * square_side / num_spaces
+        side, offset = divmod(distance, square_side)
+        if side == 0:  # Lado superior
+            positions.append((start + offset, start))
+        elif side == 1:  # Lado direito
+            positions.append((start + square_side, start + offset))
+        elif side == 2:  # Lado inferior
+            positions.append((start + square_side - offset, start + square_side))
+        else:  # Lado esquerdo
+            positions.append((start, start + square_side - offset))
+    return positions
+
+# Renderizador em modo retido: os itens estáticos do tabuleiro são criados uma única vez
+# e, a cada atualização, apenas os marcadores e as casas que mudaram de dono são alterados.
+class BoardRenderer:
+    SPACE_DIAMETER = 50
+    MARKER_RADIUS = 12
+    COLORS = ["red", "blue", "green", "orange", "purple"]
+    OWNER_COLORS = ["mistyrose", "lightsteelblue", "palegreen", "moccasin", "thistle"]  # Tons claros das cores dos jogadores
+    FREE_COLOR = "lightblue"
+
+    def __init__(self, canvas, game, space_positions):
+        self.canvas = canvas
+        self.game = game
+        if len(space_positions) != len(game.board.spaces):
+            raise ValueError("É preciso uma posição na tela para cada casa do tabuleiro.")
+        self.space_positions = space_positions
+        self.color_index = {player.name: idx for idx, player in enumerate(game.roster)}
+        self.space_items = []  # Círculo de cada casa
+        self.drawn_owners = []  # Dono desenhado em cada casa
+        self.markers = {}  # Nome do jogador -> (círculo, texto, índice da casa)
+        self.static_drawn = False
+        self.frame_count = 0
+        self.total_frame_time = 0.0
+        self.last_frame_time = 0.0
+
+    def draw_static(self):
+        canvas = self.canvas
+        # Desenha o caminho quadrado conectando os pontos com uma linha estilizada
+        if len(self.space_positions) > 1:
+            for i in range(len(self.space_positions)):
+                x1, y1 = self.space_positions[i]
+                x2, y2 = self.space_positions[(i + 1) % len(self.space_positions)]
+                canvas.create_line(x1, y1, x2, y2, fill="darkblue", width=3)
+        # Desenha cada espaço com círculos maiores e estilo diferenciado
+        radius = self.SPACE_DIAMETER / 2
+        for i, (x, y) in enumerate(self.space_positions):
+            item = canvas.create_oval(x - radius, y - radius, x + radius, y + radius,
+                                      fill=self.FREE_COLOR, outline="navy", width=2)
+            self.space_items.append(item)
+            self.drawn_owners.append(None)
+            space = self.game.board.spaces[i]
+            canvas.create_text(x, y, text=f"{i}\n{space.name}", font=("Arial", 9, "bold"), fill="navy", justify="center")
+        self.static_drawn = True
+
+    def owner_color(self, owner):
+        if owner is None:
+            return self.FREE_COLOR
+        return self.OWNER_COLORS[self.color_index.get(owner.name, 0) % len(self.OWNER_COLORS)]
+
+    def draw_space(self, index: int):
+        owner = getattr(self.game.board.spaces[index], 'owner', None)
+        if owner is not self.drawn_owners[index]:
+            self.canvas.itemconfig(self.space_items[index], fill=self.owner_color(owner))
+            self.drawn_owners[index] = owner
+
+    def draw_markers(self, players=None):
+        canvas = self.canvas
+        n = len(self.game.board.spaces)
+        r = self.MARKER_RADIUS
+        if players is None:
+            remaining = set(self.markers)
+            players = self.game.players
+        else:
+            remaining = {player.name for player in players if not self.game.is_alive(player)}
+            players = [player for player in players if player.name not in remaining]
+        for player in players:
+            remaining.discard(player.name)
+            pos_index = player.position % n
+            x, y = self.space_positions[pos_index]
+            marker = self.markers.get(player.name)
+            if marker is None:
+                color = self.COLORS[self.color_index.get(player.name, 0) % len(self.COLORS)]
+                oval = canvas.create_oval(x - r, y - r, x + r, y + r, fill=color, outline="black", width=2)
+                initials = ''.join([word[0] for word in player.name.split()])
+                text = canvas.create_text(x, y, text=initials, font=("Arial", 10, "bold"), fill="white")
+                self.markers[player.name] = (oval, text, pos_index)
+            elif marker[2] != pos_index:
+                oval, text, _ = marker
+                canvas.coords(oval, x - r, y - r, x + r, y + r)
+                canvas.coords(text, x, y)
+                self.markers[player.name] = (oval, text, pos_index)
+        # Jogadores eliminados saem do tabuleiro
+        for name in remaining:
+            if name in self.markers:
+                oval, text, _ = self.markers.pop(name)
+                canvas.delete(oval)
+                canvas.delete(text)
+
+    # Sem argumentos redesenha tudo o que mudou; com índices/jogadores, apenas o que foi marcado como sujo
+    def draw(self, spaces=None, players=None):
+        started = time.perf_counter()
+        if not self.static_drawn:
+            self.draw_static()
+            spaces = players = None
+        for i in range(len(self.space_items)) if spaces is None else spaces:
+            self.draw_space(i)
+        self.draw_markers(players)
+        self.last_frame_time = time.perf_counter() - started
+        self.frame_count += 1
+        self.total_frame_time += self.last_frame_time
+
+    def average_frame_time(self):
+        return self.total_frame_time / self.frame_count if self.frame_count else 0.0
+
 class GameUI(Observer):
-    def __init__(self, game: Game):
+    LOG_ROWS = 25  # Linhas visíveis do log; as demais são formatadas apenas ao rolar até elas
+    LOG_EVENTS = 2000  # Eventos recentes guardados com o texto completo (compras, aluguéis, eliminações...)
+    PORTFOLIO_SLOTS = 6  # Painéis de portfólio visíveis; com mais jogadores, a lista rola sobre eles
+
+    def __init__(self, game: Game, history=None):
+        load_tkinter()
         self.game = game
+        self.history = history  # history.HistoryRecorder opcional: resume os turnos que já saíram do buffer de eventos
+        self.advisor = None  # advisor.PurchaseAdvisor opcional: sugere a decisão na janela de compra
         self.root = tk.Tk()
         self.root.title("Jogo de Tabuleiro")
 
@@ -243,6 +780,22 @@ class GameUI(Observer):
         self.dice_result_label = tk.Label(self.top_frame, text="Resultado: ", font=("Arial", 12))
         self.dice_result_label.grid(row=0, column=2, padx=5, pady=5, sticky="e")
 
+        # Jogo automático: N turnos ou até haver vencedor, na velocidade máxima
+        self.autoplay_entry = tk.Entry(self.top_frame, width=5, font=("Arial", 12))
+        self.autoplay_entry.insert(0, "100")
+        self.autoplay_entry.grid(row=0, column=4, padx=5, pady=5, sticky="e")
+        self.autoplay_button = tk.Button(self.top_frame, text="Jogar Turnos", command=self.start_autoplay, font=("Arial", 12))
+        self.autoplay_button.grid(row=0, column=5, padx=5, pady=5, sticky="e")
+        self.autoplay_all_button = tk.Button(self.top_frame, text="Até o Fim", command=lambda: self.start_autoplay(True), font=("Arial", 12))
+        self.autoplay_all_button.grid(row=0, column=6, padx=5, pady=5, sticky="e")
+        # Interrompe o jogo automático (partidas em que todos compram podem não ter vencedor)
+        self.stop_button = tk.Button(self.top_frame, text="Parar", command=self.stop_autoplay, state=tk.DISABLED, font=("Arial", 12))
+        self.stop_button.grid(row=0, column=7, padx=5, pady=5, sticky="e")
+
+        # Contador de tempo de desenho do tabuleiro
+        self.frame_label = tk.Label(self.top_frame, text="Quadro: -", font=("Arial", 9), fg="gray")
+        self.frame_label.grid(row=0, column=3, padx=5, pady=5, sticky="e")
+
 
         # ----- Middle: 3 Colunas (Portfólios, Tabuleiro e Log) -----
         self.middle_frame = tk.Frame(self.root)
@@ -251,21 +804,26 @@ class GameUI(Observer):
         # Coluna 0: Portfólios dos Jogadores
         self.portfolio_frame = tk.Frame(self.middle_frame, bd=2, relief=tk.SUNKEN)
         self.portfolio_frame.grid(row=0, column=0, padx=5, pady=5, sticky="ns")
-        self.portfolio_labels = {}
-        for player in self.game.players:
-            frame = tk.LabelFrame(self.portfolio_frame, text=player.name, padx=3, pady=3)
+        # Painéis virtualizados: só PORTFOLIO_SLOTS painéis existem e são reaproveitados ao rolar a lista
+        self.portfolio_panels = []  # (moldura, rótulos) de cada painel
+        self.portfolio_first = 0  # Índice no roster do jogador exibido no primeiro painel
+        self.drawn_holdings = {}  # Painel -> (jogador, quantidade de logradouros exibida)
+        panels_frame = tk.Frame(self.portfolio_frame)
+        panels_frame.pack(side=tk.LEFT, fill=tk.Y)
+        for _ in range(min(self.PORTFOLIO_SLOTS, len(self.game.roster))):
+            frame = tk.LabelFrame(panels_frame, padx=3, pady=3)
             frame.pack(pady=3, fill=tk.X)
-            balance_label = tk.Label(frame, text=f"Saldo: {player.balance}", font=("Arial", 10))
-            balance_label.pack(anchor=tk.W)
-            position_label = tk.Label(frame, text=f"Posição: {player.position}", font=("Arial", 10))
-            position_label.pack(anchor=tk.W)
-            properties_label = tk.Label(frame, text="Logradouros: Nenhum", font=("Arial", 10))
-            properties_label.pack(anchor=tk.W)
-            self.portfolio_labels[player.name] = {
-                'balance': balance_label,
-                'position': position_label,
-                'properties': properties_label,
-            }
+            labels = {}
+            for key in ('balance', 'position', 'net_worth', 'properties'):
+                labels[key] = tk.Label(frame, font=("Arial", 10))
+                labels[key].pack(anchor=tk.W)
+            self.portfolio_panels.append((frame, labels))
+        self.portfolio_scrollbar = None
+        if len(self.game.roster) > len(self.portfolio_panels):
+            self.portfolio_scrollbar = tk.Scrollbar(self.portfolio_frame, orient=tk.VERTICAL,
+                                                    command=self.scroll_portfolios)
+            self.portfolio_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.show_portfolios(0)
 
         # Coluna 1: Visualização do Tabuleiro (Canvas + Lista de Logradouros)
         self.board_frame = tk.Frame(self.middle_frame, bd=2, relief=tk.SUNKEN)
@@ -275,114 +833,190 @@ class GameUI(Observer):
         self.board_canvas.pack()
         self.spaces_listbox = tk.Listbox(self.board_frame, width=40, font=("Arial", 9)) # Reduzido width from 50 to 40 and font from 10 to 9
         self.spaces_listbox.pack(pady=3, fill=tk.X) # Reduced pady from 5 to 3
-        self.update_space_details()
+        self.build_space_details()
 
         # Coluna 2: Log de Eventos
         self.log_frame = tk.Frame(self.middle_frame)
         self.log_frame.grid(row=0, column=2, padx=5, pady=5)
-        self.log_text = ScrolledText(self.log_frame, state='disabled', width=30, height=25, font=("Arial", 9)) # Reduzido width from 40 to 30, height from 30 to 25, and font from 10 to 9
-        self.log_text.pack(padx=5, pady=5) # Reduced padx and pady from 10 to 5
+        # Só LOG_ROWS linhas existem no widget. O log é a sequência: uma linha por turno antigo
+        # (colunas do histórico) seguida dos eventos recentes do buffer; rolar lê outro trecho dela
+        self.log_list = tk.Listbox(self.log_frame, width=45, height=self.LOG_ROWS, font=("Arial", 9))
+        self.log_list.pack(side=tk.LEFT, padx=5, pady=5)
+        self.log_scrollbar = tk.Scrollbar(self.log_frame, orient=tk.VERTICAL, command=self.scroll_log)
+        self.log_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.log_events = RingBufferSink(self.LOG_EVENTS)
+        self.log_dropped_turns = 0  # Turnos cujo TurnStarted já saiu do buffer (exibidos pelo histórico)
+        self.log_received = 0  # Eventos recebidos; muda o conteúdo do log mesmo com o buffer cheio
+        self.log_first = None  # Primeira linha exibida; None acompanha o fim do log
+        self.drawn_log = None  # (primeira, última linha, eventos recebidos) exibidos
 
 
         self.waiting_for_roll = False
-        self.current_dice = None
-
-        # ----- Geração de posições quadradas para 30 espaços -----
-        self.space_positions = []
-        canvas_width = 500 # Ajustar para o novo tamanho do canvas
-        canvas_height = 500 # Ajustar para o novo tamanho do canvas
-        square_side = 400 # Reduzir o tamanho do quadrado interno para caber no canvas menor
-        start_x = (canvas_width - square_side) / 2
-        start_y = (canvas_height - square_side) / 2
-        num_spaces = len(self.game.board.spaces)
-        spaces_per_side = num_spaces // 4
-        extra_spaces = num_spaces % 4
-
-        positions = []
-        # Lado superior
-        for i in range(spaces_per_side + (1 if extra_spaces > 0 else 0)):
-            x = start_x + i * (square_side / (spaces_per_side + (1 if extra_spaces > 0 else 0) -1 if (spaces_per_side + (1 if extra_spaces > 0 else 0)) > 1 else 1 ))
-            y = start_y
-            positions.append((x, y))
-        # Lado direito
-        for i in range(1, spaces_per_side + (1 if extra_spaces > 1 else 0)): # Start from 1 to avoid repeating corner
-            x = start_x + square_side
-            y = start_y + i * (square_side / (spaces_per_side + (1 if extra_spaces > 1 else 0) -1 if (spaces_per_side + (1 if extra_spaces > 1 else 0)) > 1 else 1 ))
-            positions.append((x, y))
-        # Lado inferior
-        for i in range(1, spaces_per_side + (1 if extra_spaces > 2 else 0)): # Start from 1 to avoid repeating corner
-            x = start_x + square_side - i * (square_side / (spaces_per_side + (1 if extra_spaces > 2 else 0) -1 if (spaces_per_side + (1 if extra_spaces > 2 else 0)) > 1 else 1 ))
-            y = start_y + square_side
-            positions.append((x, y))
-        # Lado esquerdo
-        for i in range(1, spaces_per_side + (1 if extra_spaces > 3 else 0) ): # Start from 1 to avoid repeating corner
-            x = start_x
-            y = start_y + square_side - i * (square_side / (spaces_per_side + (1 if extra_spaces > 3 else 0) -1 if (spaces_per_side + (1 if extra_spaces > 3 else 0)) > 1 else 1 ))
-            positions.append((x, y))
-
-        self.space_positions = positions[:num_spaces] # Trim if more positions than spaces
-
-
-    def update(self, event: str):
-        self.log_text.configure(state='normal')
-        self.log_text.insert(tk.END, event + "\n")
-        self.log_text.configure(state='disabled')
-        self.log_text.see(tk.END)
-        if event.startswith("É a vez de"):
-            self.turn_label.config(text=event, font=("Arial", 14, "bold"), fg="black") # Restaura a cor e fonte padrão para o turno
-        elif event.startswith("Jogador ") and event.endswith(" é o vencedor!"): # Detecta a mensagem de vitória
-            winner_name = event.split(" ")[0] + " " + event.split(" ")[1] # Extrai o nome do vencedor da mensagem
+        self.dice_callback = None  # Chamado assim que a animação termina; o controller sorteia os dados
+        self.animation_job = None  # after() pendente da animação dos dados
+        self.autoplay_callback = None
+        self.stop_callback = None
+
+        # Atualização agrupada: os eventos apenas marcam o que mudou e um único
+        # flush é agendado por ciclo ocioso do Tk
+        self.dirty_players = set()
+        self.dirty_spaces = set()
+        self.pending_winner = None
+        self.refresh_scheduled = False
+        self.max_fps = 30  # O tabuleiro é redesenhado no máximo max_fps vezes por segundo
+        self.last_flush = 0.0
+
+        # ----- Posições das casas em volta de um quadrado (uma por casa) -----
+        self.space_positions = square_positions(len(self.game.board.spaces))
+        self.board_renderer = BoardRenderer(self.board_canvas, self.game, self.space_positions)
+        self.draw_board()
+
+
+    def update(self, event):
+        self.record_event(event)
+        # Marca como sujo apenas o que o evento alterou
+        player = getattr(event, 'player', None)
+        if player is not None:
+            self.dirty_players.add(player)
+        if isinstance(event, TurnStarted):
+            self.turn_label.config(text=event.message(), font=("Arial", 14, "bold"), fg="black") # Restaura a cor e fonte padrão para o turno
+        elif isinstance(event, RentPaid):
+            self.dirty_players.add(event.owner)
+        elif isinstance(event, Purchased):
+            self.dirty_spaces.add(self.game.board.index_of(event.space))
+        elif isinstance(event, AssetsReleased):
+            self.dirty_spaces.update(self.game.board.index_of(space) for space in event.spaces)
+        elif isinstance(event, Won):
+            self.pending_winner = event.player.name
+        self.schedule_refresh()
+
+    def schedule_refresh(self):
+        if not self.refresh_scheduled:
+            self.refresh_scheduled = True
+            wait = 1.0 / self.max_fps - (time.perf_counter() - self.last_flush)
+            if wait > 0:
+                self.root.after(int(wait * 1000) + 1, self.flush)
+            else:
+                self.root.after_idle(self.flush)
+
+    def flush(self):
+        self.refresh_scheduled = False
+        self.last_flush = time.perf_counter()
+        profiler = self.game.profiler
+        if profiler is not None:
+            profiler.begin('redesenho_ui')
+        self.draw_log()
+        players, spaces = self.dirty_players, self.dirty_spaces
+        self.dirty_players, self.dirty_spaces = set(), set()
+        self.update_portfolios(players)
+        self.draw_board(spaces, players)
+        self.update_space_details(spaces)
+        if profiler is not None:
+            profiler.end()
+        if self.pending_winner:
+            winner_name, self.pending_winner = self.pending_winner, None
             self.victory_animation(winner_name) # Chama a animação de vitória
+
+    # Só os jogadores visíveis são redesenhados; os demais são lidos do jogo quando a lista rola até eles
+    def update_portfolios(self, players=None):
+        first, slots = self.portfolio_first, len(self.portfolio_panels)
+        if players is None:
+            for slot in range(slots):
+                self.draw_portfolio(slot, self.game.roster[first + slot])
+            return
+        roster_index = self.game.roster_index
+        for player in players:
+            slot = roster_index[id(player)] - first
+            if 0 <= slot < slots:
+                self.draw_portfolio(slot, player)
+
+    def draw_portfolio(self, slot: int, player: Player):
+        game = self.game
+        ownership = game.ownership
+        frame, labels = self.portfolio_panels[slot]
+        frame.config(text=player.name if game.is_alive(player) else f"{player.name} (eliminado)")
+        labels['balance'].config(text=f"Saldo: {player.balance}")
+        labels['position'].config(text=f"Posição: {player.position % len(game.board.spaces)}")
+        labels['net_worth'].config(text=f"Patrimônio: {ownership.net_worth(player)}")
+        # A lista de nomes só é remontada quando a posse do jogador exibido no painel muda
+        count = ownership.count(player)
+        if self.drawn_holdings.get(slot) != (player, count):
+            props = ', '.join([prop.name for prop in player.properties]) if player.properties else "Nenhum"
+            labels['properties'].config(text=f"Logradouros: {props}")
+            self.drawn_holdings[slot] = (player, count)
+
+    def show_portfolios(self, first: int):
+        total, slots = len(self.game.roster), len(self.portfolio_panels)
+        self.portfolio_first = max(0, min(first, total - slots))
         self.update_portfolios()
-        self.draw_board()
-        self.update_space_details()
-
-    def update_portfolios(self):
-        for player in self.game.players:
-            labels = self.portfolio_labels.get(player.name)
-            if labels:
-                labels['balance'].config(text=f"Saldo: {player.balance}")
-                labels['position'].config(text=f"Posição: {player.position % len(self.game.board.spaces)}")
-                props = ', '.join([prop.name for prop in player.properties]) if player.properties else "Nenhum"
-                labels['properties'].config(text=f"Logradouros: {props}")
-
-    def draw_board(self):
-        self.board_canvas.delete("all")
-        n = len(self.game.board.spaces)
-        # Desenha o caminho quadrado conectando os pontos com uma linha estilizada
-        if len(self.space_positions) > 1:
-            for i in range(len(self.space_positions) - 1):
-                x1, y1 = self.space_positions[i]
-                x2, y2 = self.space_positions[i+1]
-                self.board_canvas.create_line(x1, y1, x2, y2, fill="darkblue", width=3)
-            # Fecha o caminho (if needed for square, usually it closes automatically)
-            x1, y1 = self.space_positions[-1]
-            x2, y2 = self.space_positions[0]
-            self.board_canvas.create_line(x1, y1, x2, y2, fill="darkblue", width=3)
+        if self.portfolio_scrollbar is not None:
+            self.portfolio_scrollbar.set(self.portfolio_first / total, (self.portfolio_first + slots) / total)
 
-        # Desenha cada espaço com círculos maiores e estilo diferenciado
-        space_diameter = 50
-        for i, pos in enumerate(self.space_positions):
-            x, y = pos
-            self.board_canvas.create_oval(x - space_diameter/2, y - space_diameter/2,
-                                          x + space_diameter/2, y + space_diameter/2,
-                                          fill="lightblue", outline="navy", width=2)
-            space = self.game.board.spaces[i]
-            self.board_canvas.create_text(x, y, text=f"{i}\n{space.name}", font=("Arial", 9, "bold"), fill="navy", justify="center")
-        # Desenha os jogadores com marcadores coloridos
-        colors = ["red", "blue", "green", "orange", "purple"]
-        for idx, player in enumerate(self.game.players):
-            pos_index = player.position % n
-            x, y = self.space_positions[pos_index]
-            marker_radius = 12
-            self.board_canvas.create_oval(x - marker_radius, y - marker_radius,
-                                          x + marker_radius, y + marker_radius,
-                                          fill=colors[idx % len(colors)], outline="black", width=2)
-            initials = ''.join([word[0] for word in player.name.split()])
-            self.board_canvas.create_text(x, y, text=initials, font=("Arial", 10, "bold"), fill="white")
-
-    def update_space_details(self):
-        self.spaces_listbox.delete(0, tk.END)
+    # Comando da barra de rolagem: ('moveto', fração) ou ('scroll', n, 'units' | 'pages')
+    def scroll_portfolios(self, action, amount, unit=None):
+        if action == 'moveto':
+            self.show_portfolios(round(float(amount) * len(self.game.roster)))
+        else:
+            step = len(self.portfolio_panels) if unit == 'pages' else 1
+            self.show_portfolios(self.portfolio_first + int(amount) * step)
+
+    def record_event(self, event):
+        events = self.log_events.events
+        if len(events) == events.maxlen and isinstance(events[0], TurnStarted):
+            self.log_dropped_turns += 1
+        self.log_events(event)
+        self.log_received += 1
+
+    # Turnos antigos resumidos pelo histórico (sem histórico, o log é só o buffer de eventos)
+    def log_summary_rows(self):
+        return 0 if self.history is None else min(self.log_dropped_turns, len(self.history))
+
+    def log_length(self):
+        return self.log_summary_rows() + len(self.log_events.events)
+
+    def log_lines(self, first: int, last: int):
+        summary = self.log_summary_rows()
+        roster, spaces = self.game.roster, self.game.board.spaces
+        lines = [
+            f"{turn}: {roster[player].name} tirou {d1} e {d2} -> {spaces[position % len(spaces)].name}, saldo {balance}"
+            for turn, player, d1, d2, position, balance in self.history.rows(first, min(last, summary))
+        ] if first < summary else []
+        events = self.log_events.events
+        lines.extend(event.message() for event in islice(events, max(first - summary, 0), max(last - summary, 0)))
+        return lines
+
+    def draw_log(self):
+        total = self.log_length()
+        first = max(0, total - self.LOG_ROWS) if self.log_first is None else self.log_first
+        last = min(total, first + self.LOG_ROWS)
+        if (first, last, self.log_received) == self.drawn_log:
+            return
+        self.drawn_log = (first, last, self.log_received)
+        self.log_list.delete(0, tk.END)
+        self.log_list.insert(tk.END, *self.log_lines(first, last))
+        if total:
+            self.log_scrollbar.set(first / total, last / total)
+
+    # Comando da barra de rolagem do log, como scroll_portfolios; no fim volta a acompanhar os novos eventos
+    def scroll_log(self, action, amount, unit=None):
+        total = self.log_length()
+        current = self.drawn_log[0] if self.drawn_log else 0
+        if action == 'moveto':
+            first = round(float(amount) * total)
+        else:
+            first = current + int(amount) * (self.LOG_ROWS if unit == 'pages' else 1)
+        first = max(0, min(first, total - self.LOG_ROWS))
+        self.log_first = None if first >= total - self.LOG_ROWS else first
+        self.draw_log()
+
+    def draw_board(self, spaces=None, players=None):
+        self.board_renderer.draw(spaces, players)
+        renderer = self.board_renderer
+        self.frame_label.config(text=f"Quadro: {renderer.last_frame_time * 1000:.2f} ms (média {renderer.average_frame_time() * 1000:.2f} ms)")
+
+    # A lista é montada uma única vez; depois apenas as linhas das casas que mudaram de dono são trocadas
+    def build_space_details(self):
+        self.space_details = []
         for i, space in enumerate(self.game.board.spaces):
             if isinstance(space, Property):
                 detail = f"{i}: {space.name} - Imóvel | Preço: {space.price} | Aluguel: {space.rent}"
@@ -392,7 +1026,20 @@ class GameUI(Observer):
                 detail = f"{i}: {space.name} - Lugar Especial"
             else:
                 detail = f"{i}: {space.name} - Desconhecido"
-            self.spaces_listbox.insert(tk.END, detail)
+            self.space_details.append(detail)
+        self.spaces_listbox.delete(0, tk.END)
+        self.spaces_listbox.insert(tk.END, *[self.space_detail(i) for i in range(len(self.space_details))])
+
+    def space_detail(self, index: int):
+        owner = getattr(self.game.board.spaces[index], 'owner', None)
+        if owner is None:
+            return self.space_details[index]
+        return f"{self.space_details[index]} | Dono: {owner.name}"
+
+    def update_space_details(self, spaces=()):
+        for i in spaces:
+            self.spaces_listbox.delete(i)
+            self.spaces_listbox.insert(i, self.space_detail(i))
 
     def roll_dice(self):
         # Inicia a animação desabilitando o botão
@@ -406,18 +1053,57 @@ class GameUI(Observer):
             d2 = random.randint(1, 6)
             self.dice_result_label.config(text=f"Rolando... {d1} e {d2}")
             self.animation_iterations -= 1
-            self.root.after(100, self.animate_dice)
+            self.animation_job = self.root.after(100, self.animate_dice)
         else:
-            # Resultado final dos dados
-            d1 = random.randint(1, 6)
-            d2 = random.randint(1, 6)
-            self.current_dice = [d1, d2]
-            self.dice_result_label.config(text=f"Resultado: {d1} e {d2} (Total: {d1+d2})")
+            # A animação usa o random global; o resultado vem do gerador do jogo, sorteado pelo
+            # controller só se aceitar a jogada, para que o log da partida continue reproduzível
+            self.animation_job = None
             self.waiting_for_roll = False
             self.dice_button.config(state=tk.NORMAL)
+            if self.dice_callback:
+                self.dice_callback()
+
+    def show_dice(self, dice_values):
+        d1, d2 = dice_values
+        self.dice_result_label.config(text=f"Resultado: {d1} e {d2} (Total: {d1+d2})")
+
+    def start_autoplay(self, until_winner: bool = False):
+        if not self.autoplay_callback:
+            return
+        if until_winner:
+            self.autoplay_callback(None)
+            return
+        try:
+            turns = int(self.autoplay_entry.get())
+        except ValueError:
+            messagebox.showerror("Jogo automático", "Informe um número de turnos válido.")
+            return
+        self.autoplay_callback(max(turns, 0))
+
+    def set_autoplay(self, running: bool):
+        if running and self.animation_job is not None:  # Rolagem manual em andamento é descartada
+            self.root.after_cancel(self.animation_job)
+            self.animation_job = None
+            self.dice_result_label.config(text="Resultado: ")
+        state = tk.DISABLED if running else tk.NORMAL
+        self.dice_button.config(state=state)
+        self.autoplay_button.config(state=state)
+        self.autoplay_all_button.config(state=state)
+        self.stop_button.config(state=tk.NORMAL if running else tk.DISABLED)
+
+    def stop_autoplay(self):
+        if self.stop_callback:
+            self.stop_callback()
 
     def ask_purchase(self, player: Player, space: Space):
-        return messagebox.askyesno("Opção de Compra", f"{player.name}, deseja comprar {space.name} por {space.price}?")
+        question = f"{player.name}, deseja comprar {space.name} por {space.price}?"
+        if self.advisor is not None:
+            recommendation = self.advisor.advise(self.game, space)
+            suggestion = "comprar" if recommendation.buy else "não comprar"
+            margin = recommendation.buy_value - recommendation.pass_value
+            question += (f"\n\nSugestão: {suggestion} (vantagem estimada da compra: {margin:+.0f}, "
+                         f"{recommendation.depth} turnos à frente)")
+        return messagebox.askyesno("Opção de Compra", question)
 
     def victory_animation(self, winner_name: str):
         messagebox.showinfo("Vitória!", f"{winner_name} é o grande Vencedor!")
@@ -432,78 +1118,150 @@ class GameUI(Observer):
 # Controller do Jogo (Integra Lógica e Interface)
 # ====================================
 
+# Máquina de estados do turno: reage ao evento de dados rolados, sem polling
 class GameController:
-    def __init__(self, game: Game, ui: GameUI):
+    IDLE = 'ocioso'
+    WAITING_FOR_ROLL = 'aguardando_dados'
+    RESOLVING = 'resolvendo'
+    FINISHED = 'encerrado'
+
+    AUTOPLAY_SLICE = 0.02  # Segundos de jogo automático antes de devolver o controle ao Tk
+
+    def __init__(self, game: Game, ui: GameUI, turn_delay: int = 0):
         self.game = game
         self.ui = ui
         self.game.add_observer(ui)
         self.game.purchase_callback = ui.ask_purchase
+        self.ui.dice_callback = self.on_dice_rolled
+        self.ui.autoplay_callback = self.autoplay
+        self.ui.stop_callback = self.stop_autoplay
         self.current_turn_player = None
+        self.turn_delay = turn_delay  # Pausa opcional entre turnos, em ms
+        self.state = self.IDLE
+        self.autoplay_remaining = 0
+        self.autoplay_policy = AlwaysBuyPolicy()
 
     def start_game(self):
-        self.game.log_event("Iniciando o jogo.")
-        self.process_turn()
+        self.game.emit(GameStarted)
+        self.begin_turn()
 
-    def process_turn(self):
-        if not self.game.active or len(self.game.players) == 0:
+    def begin_turn(self):
+        if not self.game.active or len(self.game.turn_order) == 0:
+            self.state = self.FINISHED
             return
-        player = self.game.players[self.game.current_player_index]
-        self.current_turn_player = player
-        self.game.log_event(f"É a vez de {player.name}.")
+        self.current_turn_player = self.game.start_turn()
+        self.state = self.WAITING_FOR_ROLL
         self.ui.waiting_for_roll = True
-        self.check_dice_roll()
-
-    def check_dice_roll(self):
-        if self.ui.current_dice is not None:
-            dice_values = self.ui.current_dice
-            self.ui.current_dice = None
-            player = self.current_turn_player
-            steps = sum(dice_values)
-            self.game.log_event(f"{player.name} rolou os dados: {dice_values} totalizando {steps}.")
-            prev_position = player.position
-            player.position += steps
-            if player.position // len(self.game.board.spaces) > prev_position // len(self.game.board.spaces):
-                player.adjust_balance(self.game.starting_bonus)
-                self.game.log_event(f"{player.name} passou pelo Ponto de Partida e recebeu {self.game.starting_bonus}.")
-            current_space = self.game.board.get_space(player.position)
-            current_space.landed_on(player, dice_values, self.game)
-            if self.game.active:
-                self.game.current_player_index = (self.game.current_player_index + 1) % len(self.game.players)
-                self.ui.root.after(1000, self.process_turn)
+
+    # Resolve o turno atual; devolve False quando o jogo termina
+    def resolve_turn(self, dice_values):
+        self.state = self.RESOLVING
+        self.game.play_turn(self.current_turn_player, dice_values)
+        if not self.game.active:
+            self.state = self.FINISHED
+            return False
+        return True
+
+    def on_dice_rolled(self):
+        if self.state != self.WAITING_FOR_ROLL or self.autoplay_remaining:
+            return
+        dice_values = self.game.roll_dice()  # Sorteado só quando a jogada é aceita
+        self.ui.show_dice(dice_values)
+        if self.resolve_turn(dice_values):
+            if self.turn_delay:
+                self.ui.root.after(self.turn_delay, self.begin_turn)
+            else:
+                self.begin_turn()
+
+    # Joga N turnos (ou até haver vencedor, com turns=None) na velocidade máxima
+    def autoplay(self, turns=None):
+        if self.state == self.FINISHED or self.autoplay_remaining:
+            return
+        self.autoplay_remaining = turns if turns is not None else math.inf
+        self.game.purchase_callback = lambda player, space: self.autoplay_policy.should_buy(player, space, self.game)
+        self.ui.set_autoplay(True)
+        self.autoplay_step()
+
+    def autoplay_step(self):
+        deadline = time.perf_counter() + self.AUTOPLAY_SLICE
+        while self.autoplay_remaining > 0 and self.state == self.WAITING_FOR_ROLL:
+            self.autoplay_remaining -= 1
+            if not self.resolve_turn(self.game.roll_dice()):
+                break
+            self.begin_turn()
+            if time.perf_counter() >= deadline:
+                break
+        if self.autoplay_remaining > 0 and self.state == self.WAITING_FOR_ROLL:
+            self.ui.root.after(0, self.autoplay_step)
         else:
-            self.ui.root.after(100, self.check_dice_roll)
+            self.stop_autoplay()
+
+    def stop_autoplay(self):
+        self.autoplay_remaining = 0
+        self.game.purchase_callback = self.ui.ask_purchase
+        self.ui.set_autoplay(False)
 
 # ====================================
 # Função Principal
 # ====================================
 
-def main():
-    # Criação de um tabuleiro com 30 espaços usando uma variação entre os tipos
+# Criação de um tabuleiro com 30 espaços usando uma variação entre os tipos
+# Os valores de preço, aluguel e taxa podem ser ajustados (balance_sweep.py varre esses parâmetros);
+# variable_parity é a paridade do índice das empresas com taxa variável
+def build_default_board(num_spaces: int = 30, price_base: int = 100, price_step: int = 10, rent_base: int = 10,
+                        rent_step: int = 1, company_price_base: int = 150, company_price_step: int = 5,
+                        fee_base: int = 5, fee_step: int = 1, variable_parity: int = 1):
     spaces = []
-    for i in range(30):
+    for i in range(num_spaces):
         if i == 0:
-            spaces.append(SpecialPlace("Ponto de Partida", lambda p, g: None))
+            spaces.append(SpecialPlace("Ponto de Partida", no_effect))
         else:
             if i % 3 == 0:
-                spaces.append(SpaceFactory.create_space('property', name=f"Rua {i}", price=100 + i * 10, rent=10 + i))
+                spaces.append(SpaceFactory.create_space('property', name=f"Rua {i}", price=price_base + i * price_step, rent=rent_base + i * rent_step))
             elif i % 3 == 1:
-                fee_strategy = 'fixed' if i % 2 == 0 else 'variable'
-                spaces.append(SpaceFactory.create_space('company', name=f"Empresa {i}", price=150 + i * 5, base_fee=5 + i, fee_strategy=fee_strategy))
+                fee_strategy = 'variable' if i % 2 == variable_parity else 'fixed'
+                spaces.append(SpaceFactory.create_space('company', name=f"Empresa {i}", price=company_price_base + i * company_price_step, base_fee=fee_base + i * fee_step, fee_strategy=fee_strategy))
             else:
                 if i % 2 == 0:
                     spaces.append(SpaceFactory.create_space('special', name=f"Praça {i}", effect=bonus_effect))
                 else:
                     spaces.append(SpaceFactory.create_space('special', name=f"Penalidade {i}", effect=move_effect(1)))
+    return Board(spaces)
 
-    board = Board(spaces)
+def main():
+    # JOGO_TABULEIRO=arquivo (.json, .jsonl ou .csv) joga em um tabuleiro gravado, ex.: um gerado por balance_sweep.py
+    board_path = os.environ.get("JOGO_TABULEIRO")
+    if board_path:
+        from board_loader import load_board
+        board = load_board(board_path)
+    else:
+        board = build_default_board()
     player1 = Player("Jogador 1")
     player2 = Player("Jogador 2")
     players = [player1, player2]
     game = Game(board, players, starting_bonus=100)
-    ui = GameUI(game)
+    game.add_sink(StdoutSink())
+    # JOGO_PERFIL=arquivo.json (ou .folded) grava o perfil das fases do turno ao sair
+    profile_path = os.environ.get("JOGO_PERFIL")
+    if profile_path:
+        from profiling import Profiler
+        Profiler().attach(game)
+    from gamelog import GameRecorder
+    recorder = GameRecorder(game, "ultima_partida.jtlg")  # Permite reproduzir a partida com gamelog.py
+    from history import HistoryRecorder
+    history = HistoryRecorder(game, "historico")  # Histórico colunar completo (python history.py historico)
+    ui = GameUI(game, history)
+    from advisor import PurchaseAdvisor
+    ui.advisor = PurchaseAdvisor(board, game.starting_bonus)
     controller = GameController(game, ui)
     ui.root.after(1000, controller.start_game)
     ui.start()
+    recorder.close()
+    history.close()
+    if profile_path:
+        game.profiler.save(profile_path)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # Executa pelo módulo importável "app", para que advisor, gamelog etc. vejam as mesmas classes e efeitos
+    from app import main as app_main
+    app_main()
\ No newline at end of file
@@ -0,0 +1,193 @@
+# ====================================
+# Varredura e otimização do balanceamento do tabuleiro
+# ====================================
+# Gera variantes do tabuleiro padrão a partir de parâmetros (preços, aluguéis,
+# taxas e quais empresas usam taxa variável), avalia cada uma com muitas
+# partidas com semente fixa em um pool de processos e procura os parâmetros
+# que deixam a vantagem do primeiro jogador perto de zero e a duração mediana
+# perto do alvo. As avaliações ficam em cache por hash do tabuleiro e os
+# melhores tabuleiros são gravados em arquivos carregáveis (board_loader.py).
+
+import argparse
+import json
+import os
+import random
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from app import build_default_board
+from board_loader import save_board
+from gamelog import board_digest
+from payoff import TableEngine, compile_tables
+from simulation import game_seed
+
+DEFAULT_CACHE = "balance_cache.json"
+
+BoardParams = namedtuple("BoardParams", [
+    "price_base", "price_step", "rent_base", "rent_step", "company_price_base", "company_price_step",
+    "fee_base", "fee_step", "variable_parity",
+])
+DEFAULT_PARAMS = BoardParams(100, 10, 10, 1, 150, 5, 5, 1, 1)  # Valores padrão de build_default_board
+PARAM_STEPS = BoardParams(10, 2, 2, 1, 10, 2, 1, 1, 1)  # Perturbação máxima de cada parâmetro
+
+def generate_board(params: BoardParams, num_spaces: int = 30):
+    return build_default_board(num_spaces, **params._asdict())
+
+def perturb(params: BoardParams, rng: random.Random):
+    values = list(params)
+    for k in rng.sample(range(len(values)), rng.randint(1, 3)):
+        if BoardParams._fields[k] == "variable_parity":
+            values[k] = 1 - values[k]
+        else:
+            values[k] = max(1, values[k] + rng.randint(-PARAM_STEPS[k], PARAM_STEPS[k]))
+    return BoardParams(*values)
+
+# Executado em cada processo: joga as partidas pelo motor de tabelas (idêntico ao Game, política padrão)
+def evaluate(params: BoardParams, num_games: int, seed: int, max_turns: int, num_players: int = 2,
+             balance: int = 500):
+    tables = compile_tables(generate_board(params))
+    wins = [0] * num_players
+    lengths = []
+    unfinished = 0
+    for game_index in range(num_games):
+        engine = TableEngine(tables, [balance] * num_players, seed=game_seed(seed, game_index)).run(max_turns)
+        if engine.winner is None:
+            unfinished += 1
+        else:
+            wins[engine.winner] += 1
+        lengths.append(engine.turns)
+    lengths.sort()
+    decided = num_games - unfinished
+    return {
+        'games': num_games,
+        'wins': wins,
+        'unfinished': unfinished,
+        # Taxa de vitória do primeiro jogador acima da parte justa, entre as partidas decididas
+        'first_player_advantage': wins[0] / decided - 1 / num_players if decided else 0.0,
+        'median_turns': lengths[len(lengths) // 2],
+    }
+
+def score(metrics, target_turns: int):
+    return (abs(metrics['first_player_advantage'])
+            + abs(metrics['median_turns'] - target_turns) / target_turns
+            + metrics['unfinished'] / metrics['games'])
+
+class EvaluationCache:
+    def __init__(self, path: str):
+        self.path = path
+        self.entries = {}
+        if path and os.path.exists(path):
+            with open(path, encoding='utf-8') as file:
+                self.entries = json.load(file)
+
+    @staticmethod
+    def settings(num_games: int, seed: int, max_turns: int):
+        return f"{num_games}:{seed}:{max_turns}"
+
+    @staticmethod
+    def key(params: BoardParams, settings: str):
+        return f"{board_digest(generate_board(params)).hex()}:{settings}"
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        return entry['metrics'] if entry else None
+
+    def put(self, key, params: BoardParams, metrics):
+        self.entries[key] = {'params': list(params), 'metrics': metrics}
+
+    # Variantes já avaliadas com as mesmas configurações (retomam a busca de onde parou)
+    def known(self, settings: str):
+        for key, entry in self.entries.items():
+            if key.endswith(':' + settings):
+                yield BoardParams(*entry['params']), entry['metrics']
+
+    def save(self):
+        if self.path:
+            with open(self.path, 'w', encoding='utf-8') as file:
+                json.dump(self.entries, file)
+
+class BalanceOptimizer:
+    def __init__(self, num_games: int = 2000, seed: int = 0, max_turns: int = 1000, target_turns: int = 100,
+                 workers: int = None, cache: EvaluationCache = None):
+        self.num_games = num_games
+        self.seed = seed  # Mesmas sementes para todas as variantes: as diferenças não vêm do acaso
+        self.max_turns = max_turns
+        self.target_turns = target_turns
+        self.workers = workers or os.cpu_count() or 1
+        self.cache = cache or EvaluationCache(None)
+        self.settings = EvaluationCache.settings(num_games, seed, max_turns)
+        self.results = {params: (score(metrics, target_turns), metrics)
+                        for params, metrics in self.cache.known(self.settings)}  # Parâmetros -> (pontuação, métricas)
+        self.evaluated = 0
+
+    def evaluate_all(self, candidates, pool):
+        pending = {}
+        for params in dict.fromkeys(candidates):
+            if params in self.results:
+                continue
+            key = EvaluationCache.key(params, self.settings)
+            metrics = self.cache.get(key)
+            if metrics is not None:
+                self.results[params] = (score(metrics, self.target_turns), metrics)
+            else:
+                pending[params] = (key, pool.submit(evaluate, params, self.num_games, self.seed, self.max_turns))
+        for params, (key, future) in pending.items():
+            metrics = future.result()
+            self.cache.put(key, params, metrics)
+            self.results[params] = (score(metrics, self.target_turns), metrics)
+            self.evaluated += 1
+
+    def best(self, count: int = 1):
+        return sorted(self.results.items(), key=lambda item: item[1][0])[:count]
+
+    # Busca local com população: perturba os melhores parâmetros a cada geração;
+    # progress(geração, pontuação, métricas) é chamado com o melhor resultado de cada uma
+    def run(self, generations: int = 10, population: int = 16, elite: int = 4, rng_seed: int = 0, progress=None):
+        rng = random.Random(rng_seed)
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            start = [params for params, _ in self.best(elite)] or [DEFAULT_PARAMS]
+            candidates = [DEFAULT_PARAMS] + [perturb(rng.choice(start), rng) for _ in range(population - 1)]
+            for generation in range(generations):
+                self.evaluate_all(candidates, pool)
+                parents = [params for params, _ in self.best(elite)]
+                if progress:
+                    value, metrics = self.results[parents[0]]
+                    progress(generation + 1, value, metrics)
+                candidates = [perturb(rng.choice(parents), rng) for _ in range(population)]
+        self.cache.save()
+        return self.best(elite)
+
+def print_progress(generation: int, value: float, metrics):
+    print(f"Geração {generation}: pontuação {value:.3f}, vantagem do 1º jogador "
+          f"{metrics['first_player_advantage']:+.3f}, mediana {metrics['median_turns']} turnos, "
+          f"sem vencedor {metrics['unfinished']}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Otimiza preços, aluguéis e taxas do tabuleiro.")
+    parser.add_argument("--games", type=int, default=2000, help="partidas por variante")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-turns", type=int, default=1000)
+    parser.add_argument("--target-turns", type=int, default=100, help="duração mediana desejada")
+    parser.add_argument("--generations", type=int, default=10)
+    parser.add_argument("--population", type=int, default=16)
+    parser.add_argument("--top", type=int, default=3, help="quantos tabuleiros gravar")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--cache", default=DEFAULT_CACHE)
+    parser.add_argument("--output-dir", default="tabuleiros")
+    args = parser.parse_args()
+
+    optimizer = BalanceOptimizer(args.games, args.seed, args.max_turns, args.target_turns, args.workers,
+                                 EvaluationCache(args.cache))
+    started = time.perf_counter()
+    best = optimizer.run(args.generations, args.population, max(args.top, 2), progress=print_progress)
+    elapsed = time.perf_counter() - started
+    print(f"{optimizer.evaluated} variantes simuladas ({len(optimizer.results)} avaliadas) em {elapsed:.1f}s")
+    os.makedirs(args.output_dir, exist_ok=True)
+    for rank, (params, (value, metrics)) in enumerate(best[:args.top], start=1):
+        path = os.path.join(args.output_dir, f"balanceado_{rank}.json")
+        save_board(generate_board(params), path)
+        print(f"{path}: pontuação {value:.3f}, {dict(params._asdict())}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+# ====================================
+# Benchmarks de desempenho com verificação de regressão
+# ====================================
+# Mede, com sementes fixas: turnos por segundo do Game, custo de landed_on por
+# tipo de casa, custo de distribuir eventos conforme o número de assinantes,
+# construção de tabuleiros grandes e tempo de quadro do desenho do tabuleiro
+# (com um canvas simulado). O resultado sai em JSON e pode ser comparado a um
+# arquivo de referência com tolerância configurável.
+
+import argparse
+import json
+import sys
+import time
+
+from app import (AlwaysBuyPolicy, BoardRenderer, Game, NeverBuyPolicy, Observer, Player, SpaceFactory,
+                 bonus_effect, build_default_board, move_effect, no_effect)
+from events import TurnStarted
+from payoff import TableEngine, compile_tables
+from simulation import HeadlessRunner, make_players
+
+DEFAULT_BASELINE = "benchmarks_baseline.json"
+
+def best_time(function, repeats: int = 5):
+    best = float('inf')
+    for _ in range(repeats):
+        started = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+def metric(value, unit: str, higher_is_better: bool):
+    return {'value': value, 'unit': unit, 'higher_is_better': higher_is_better}
+
+# As mesmas partidas (sementes fixas) em cada repetição: o total de turnos não muda
+def bench_turn_throughput(num_games: int = 50, max_turns: int = 500):
+    turns = []
+
+    def run():
+        turns.append(sum(HeadlessRunner(Game(build_default_board(), make_players(2), seed=seed),
+                                        max_turns=max_turns).run().turns for seed in range(num_games)))
+    elapsed = best_time(run, repeats=3)
+    return {'turns_per_second': metric(turns[0] / elapsed, 'turnos/s', True)}
+
+# Mesmas partidas do bench_turn_throughput, pelo motor de tabelas pré-compiladas
+def bench_table_engine(num_games: int = 50, max_turns: int = 500):
+    tables = compile_tables(build_default_board())
+    turns = []
+
+    def run():
+        turns.append(sum(TableEngine(tables, [500, 500], seed=seed).run(max_turns).turns for seed in range(num_games)))
+    elapsed = best_time(run, repeats=3)
+    return {'table_turns_per_second': metric(turns[0] / elapsed, 'turnos/s', True)}
+
+def bench_landed_on(calls: int = 20000):
+    results = {}
+    cases = {
+        'property_rent': SpaceFactory.create_space('property', name="Rua", price=100, rent=10),
+        'company_fixed': SpaceFactory.create_space('company', name="Empresa", price=150, base_fee=5, fee_strategy='fixed'),
+        'company_variable': SpaceFactory.create_space('company', name="Empresa", price=150, base_fee=5, fee_strategy='variable'),
+        'property_declined': SpaceFactory.create_space('property', name="Rua Livre", price=100, rent=10),
+        'special_none': SpaceFactory.create_space('special', name="Partida", effect=no_effect),
+        'special_bonus': SpaceFactory.create_space('special', name="Praça", effect=bonus_effect),
+        'special_move': SpaceFactory.create_space('special', name="Avanço", effect=move_effect(1)),
+    }
+    for name, space in cases.items():
+        payer, owner = Player("Jogador 1", 10 ** 12), Player("Jogador 2")
+        game = Game(build_default_board(), [payer, owner], seed=0)
+        game.purchase_callback = lambda player, s: NeverBuyPolicy().should_buy(player, s, game)
+        if hasattr(space, 'owner') and name != 'property_declined':
+            space.owner = owner
+        dice_values = [3, 4]
+        landed_on = space.landed_on
+
+        def run():
+            for _ in range(calls):
+                landed_on(payer, dice_values, game)
+        results[f"landed_on_{name}"] = metric(best_time(run) / calls * 1e9, 'ns/chamada', False)
+    return results
+
+class NullObserver(Observer):
+    def update(self, event):
+        pass
+
+def bench_observer_fanout(events: int = 20000, counts=(0, 1, 10, 100)):
+    results = {}
+    player = Player("Jogador 1")
+    for count in counts:
+        game = Game(build_default_board(), [player], seed=0)
+        for _ in range(count):
+            game.add_observer(NullObserver())
+
+        def run():
+            emit = game.emit
+            for _ in range(events):
+                emit(TurnStarted, player)
+        results[f"fanout_{count}_observers"] = metric(best_time(run) / events * 1e9, 'ns/evento', False)
+    return results
+
+def bench_board_construction(sizes=(1000, 10000, 100000)):
+    return {f"build_board_{size}": metric(best_time(lambda: build_default_board(size), repeats=3) * 1000, 'ms', False)
+            for size in sizes}
+
+# Canvas falso: registra apenas o número de operações, sem Tk
+class MockCanvas:
+    def __init__(self):
+        self.next_id = 0
+        self.operations = 0
+
+    def create_item(self, *args, **kwargs):
+        self.next_id += 1
+        self.operations += 1
+        return self.next_id
+
+    create_line = create_oval = create_text = create_item
+
+    def coords(self, *args):
+        self.operations += 1
+
+    def itemconfig(self, *args, **kwargs):
+        self.operations += 1
+
+    def delete(self, *args):
+        self.operations += 1
+
+def bench_draw_board(num_spaces: int = 30, frames: int = 2000):
+    game = Game(build_default_board(num_spaces), make_players(4), seed=0)
+    game.purchase_callback = lambda player, space: AlwaysBuyPolicy().should_buy(player, space, game)
+    positions = [(i % 100 * 5.0, i // 100 * 5.0) for i in range(num_spaces)]
+    # O primeiro quadro cria todos os itens do canvas; cada repetição usa um renderer novo
+    first = min(best_time(BoardRenderer(MockCanvas(), game, positions).draw, repeats=1) for _ in range(5))
+    renderer = BoardRenderer(MockCanvas(), game, positions)
+    renderer.draw()
+    timings = []
+    for _ in range(frames):
+        if game.active:
+            game.play_turn(game.start_turn(), game.roll_dice())
+        started = time.perf_counter()
+        renderer.draw()
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    return {
+        f"draw_board_first_frame_{num_spaces}": metric(first * 1000, 'ms', False),
+        f"draw_board_frame_median_{num_spaces}": metric(timings[len(timings) // 2] * 1000, 'ms', False),
+    }
+
+def run_all(quick: bool = False):
+    results = {}
+    results.update(bench_turn_throughput(10 if quick else 50))
+    results.update(bench_table_engine(10 if quick else 50))
+    results.update(bench_landed_on(2000 if quick else 20000))
+    results.update(bench_observer_fanout(2000 if quick else 20000))
+    results.update(bench_board_construction((1000, 10000) if quick else (1000, 10000, 100000)))
+    for size in (30, 1000):
+        results.update(bench_draw_board(size, 200 if quick else 2000))
+    return results
+
+# Compara com a referência; devolve a lista de métricas que pioraram além da tolerância
+def compare(results, baseline, tolerance: float):
+    regressions = []
+    for name, current in results.items():
+        reference = baseline.get(name)
+        if not reference or not reference['value']:
+            continue
+        ratio = current['value'] / reference['value']
+        worse = ratio < 1 - tolerance if current['higher_is_better'] else ratio > 1 + tolerance
+        current['baseline'] = reference['value']
+        current['ratio'] = ratio
+        if worse:
+            regressions.append(name)
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks do jogo com verificação de regressão.")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="grava os resultados como nova referência")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="piora relativa aceita (0.2 = 20%%)")
+    parser.add_argument("--output", default=None, help="arquivo JSON de saída (padrão: stdout)")
+    parser.add_argument("--quick", action="store_true", help="execução reduzida")
+    args = parser.parse_args()
+
+    results = run_all(args.quick)
+    regressions = []
+    missing_baseline = False
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as file:
+            json.dump(results, file, indent=2)
+    else:
+        try:
+            with open(args.baseline, encoding='utf-8') as file:
+                regressions = compare(results, json.load(file), args.tolerance)
+        except FileNotFoundError:
+            missing_baseline = True
+    report = json.dumps({'results': results, 'regressions': regressions, 'tolerance': args.tolerance}, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            file.write(report)
+    else:
+        print(report)
+    # Sem referência não há como afirmar que não houve regressão: a verificação falha
+    if missing_baseline:
+        print(f"Referência {args.baseline} não encontrada; grave uma com --save-baseline.", file=sys.stderr)
+        raise SystemExit(2)
+    if regressions:
+        print(f"Regressões acima de {args.tolerance:.0%}: {', '.join(regressions)}", file=sys.stderr)
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+# ====================================
+# Carregamento de tabuleiros a partir de arquivos (JSON, JSONL e CSV)
+# ====================================
+# Cada casa é descrita por um registro com o tipo e seus parâmetros; os efeitos
+# dos lugares especiais são referenciados pelo nome no registro de efeitos
+# (app.EFFECTS). JSONL e CSV são lidos em fluxo, linha a linha, para permitir
+# tabuleiros com milhões de casas sem carregar o arquivo inteiro na memória.
+# O formato colunar binário (.cols) é o mais rápido: é lido direto em arrays e
+# vira um ArrayBoard, que só cria o objeto de cada casa no primeiro acesso.
+#
+#   {"type": "property", "name": "Rua 3", "price": 130, "rent": 13}
+#   {"type": "company", "name": "Empresa 1", "price": 155, "base_fee": 6, "fee_strategy": "variable"}
+#   {"type": "special", "name": "Avanço 5", "effect": "move", "steps": 1}
+
+import argparse
+import csv
+import gc
+import json
+import os
+import struct
+import time
+from array import array
+from collections.abc import Sequence
+
+from app import (FEE_STRATEGIES, Board, Company, Property, SpecialPlace, build_default_board, effect_name,
+                 fee_strategy_name, resolve_effect)
+
+CSV_FIELDS = ('type', 'name', 'price', 'rent', 'base_fee', 'fee_strategy', 'effect', 'steps')
+
+# Formato .cols: assinatura, cabeçalho JSON com tamanho prefixado, as colunas na ordem abaixo e os nomes em UTF-8
+COLS_MAGIC = b'TABC'
+COLS_HEADER = struct.Struct('<4sI')
+KINDS = ('property', 'company', 'special')
+# kind: índice em KINDS; amount: aluguel ou taxa base; variant: estratégia (FEE_STRATEGIES) ou efeito
+# (lista "effects" do cabeçalho); name_end: fim do nome de cada casa no bloco de nomes
+COLS_COLUMNS = {'kind': 'b', 'price': 'q', 'amount': 'q', 'variant': 'h', 'name_end': 'q'}
+
+# Construção direta (sem SpaceFactory) para evitar o custo dos **kwargs por casa
+def build_space(space_type, name, price, rent, base_fee, fee_strategy, effect, steps):
+    if space_type == 'property':
+        return Property(name, int(price), int(rent))
+    if space_type == 'company':
+        strategy = FEE_STRATEGIES.get(fee_strategy or 'fixed')
+        if strategy is None:
+            raise ValueError(f"Estratégia de taxa desconhecida: {fee_strategy}.")
+        return Company(name, int(price), int(base_fee), strategy)
+    if space_type == 'special':
+        return SpecialPlace(name, resolve_effect(effect or 'none', steps))
+    raise ValueError(f"Tipo de logradouro desconhecido: {space_type}.")
+
+def space_from_record(record: dict):
+    get = record.get
+    return build_space(get('type'), get('name'), get('price'), get('rent'), get('base_fee'), get('fee_strategy'),
+                       get('effect'), get('steps'))
+
+def space_to_record(space):
+    if space.kind == 'property':
+        return {'type': 'property', 'name': space.name, 'price': space.price, 'rent': space.rent}
+    if space.kind == 'company':
+        return {'type': 'company', 'name': space.name, 'price': space.price, 'base_fee': space.base_fee,
+                'fee_strategy': fee_strategy_name(space.fee_strategy)}
+    name, steps = effect_name(space.effect)
+    record = {'type': 'special', 'name': space.name, 'effect': name}
+    if steps is not None:
+        record['steps'] = steps
+    return record
+
+def iter_jsonl(path: str):
+    loads = json.loads
+    with open(path, encoding='utf-8') as file:
+        for line in file:
+            if line.strip():
+                yield space_from_record(loads(line))
+
+def iter_csv(path: str):
+    with open(path, encoding='utf-8', newline='') as file:
+        reader = csv.reader(file)
+        header = next(reader)
+        missing = set(CSV_FIELDS) - set(header)
+        if missing:
+            raise ValueError(f"Colunas ausentes no CSV: {', '.join(sorted(missing))}.")
+        columns = [header.index(field) for field in CSV_FIELDS]
+        if columns == list(range(len(CSV_FIELDS))):
+            for row in reader:
+                yield build_space(*row[:8])
+        else:
+            for row in reader:
+                yield build_space(*[row[c] for c in columns])
+
+def iter_spaces(path: str):
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.jsonl':
+        return iter_jsonl(path)
+    if extension == '.csv':
+        return iter_csv(path)
+    if extension == '.json':
+        with open(path, encoding='utf-8') as file:
+            data = json.load(file)
+        records = data['spaces'] if isinstance(data, dict) else data
+        return map(space_from_record, records)
+    raise ValueError(f"Formato de tabuleiro não suportado: {extension}.")
+
+# ====================================
+# Tabuleiro em arrays (formato .cols)
+# ====================================
+
+# Sequência de casas sobre as colunas: cada Space é criado no primeiro acesso e guardado,
+# para que o dono e o índice continuem no próprio objeto, como em um Board comum
+class SpaceColumns(Sequence):
+    def __init__(self, columns, names: bytes, effects):
+        self.columns = columns
+        self.names = names
+        self.effects = effects  # (nome, passos) de cada variant dos lugares especiais
+        self.strategies = [FEE_STRATEGIES[name] for name in FEE_STRATEGIES]
+        self.built = [None] * len(columns['kind'])
+
+    def __len__(self):
+        return len(self.built)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        space = self.built[index]
+        if space is None:
+            space = self.build(index % len(self.built))
+        return space
+
+    def __iter__(self):
+        built = self.built
+        for i in range(len(built)):
+            space = built[i]
+            yield space if space is not None else self.build(i)
+
+    def build(self, i: int):
+        columns = self.columns
+        start = columns['name_end'][i - 1] if i else 0
+        name = self.names[start:columns['name_end'][i]].decode('utf-8')
+        kind = columns['kind'][i]
+        if kind == 0:
+            space = Property(name, columns['price'][i], columns['amount'][i])
+        elif kind == 1:
+            space = Company(name, columns['price'][i], columns['amount'][i], self.strategies[columns['variant'][i]])
+        else:
+            effect, steps = self.effects[columns['variant'][i]]
+            space = SpecialPlace(name, resolve_effect(effect, steps))
+        space.index = i
+        self.built[i] = space
+        return space
+
+class ArrayBoard(Board):
+    def __init__(self, spaces: SpaceColumns):
+        self.spaces = spaces  # Os índices são atribuídos por SpaceColumns.build
+        self.start_position = 0
+
+    def kind_totals(self):
+        kinds = self.spaces.columns['kind']
+        totals = {'property': kinds.count(0), 'company': kinds.count(1)}
+        return {kind: total for kind, total in totals.items() if total}  # Como Board.kind_totals: só tipos presentes
+
+def load_columns(path: str):
+    with open(path, 'rb') as file:
+        magic, header_size = COLS_HEADER.unpack(file.read(COLS_HEADER.size))
+        if magic != COLS_MAGIC:
+            raise ValueError("Arquivo de tabuleiro colunar inválido.")
+        header = json.loads(file.read(header_size))
+        count = header['spaces']
+        columns = {}
+        for name, code in COLS_COLUMNS.items():
+            columns[name] = array(code)
+            columns[name].fromfile(file, count)
+        names = file.read()
+    if not count:
+        raise ValueError("O tabuleiro precisa ter ao menos uma casa.")
+    effects = [(name, steps) for name, steps in header['effects']]
+    return ArrayBoard(SpaceColumns(columns, names, effects))
+
+def save_columns(board, path: str):
+    columns = {name: array(code) for name, code in COLS_COLUMNS.items()}
+    strategies = {name: i for i, name in enumerate(FEE_STRATEGIES)}
+    effects = {}  # (nome, passos) -> variant
+    names = bytearray()
+    for space in board.spaces:
+        price = amount = variant = 0
+        if space.kind == 'property':
+            price, amount = space.price, space.rent
+        elif space.kind == 'company':
+            price, amount = space.price, space.base_fee
+            variant = strategies[fee_strategy_name(space.fee_strategy)]
+        else:
+            variant = effects.setdefault(effect_name(space.effect), len(effects))
+        columns['kind'].append(KINDS.index(space.kind))
+        columns['price'].append(price)
+        columns['amount'].append(amount)
+        columns['variant'].append(variant)
+        names += space.name.encode('utf-8')
+        columns['name_end'].append(len(names))
+    header = json.dumps({'spaces': len(columns['kind']), 'effects': list(effects)}).encode('utf-8')
+    with open(path, 'wb') as file:
+        file.write(COLS_HEADER.pack(COLS_MAGIC, len(header)) + header)
+        for name in COLS_COLUMNS:
+            columns[name].tofile(file)
+        file.write(names)
+
+def load_board(path: str):
+    if os.path.splitext(path)[1].lower() == '.cols':
+        return load_columns(path)
+    # Milhões de objetos novos disparariam várias coletas completas do gc sem liberar nada
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        spaces = list(iter_spaces(path))
+    finally:
+        if gc_enabled:
+            gc.enable()
+    if not spaces:
+        raise ValueError("O tabuleiro precisa ter ao menos uma casa.")
+    return Board(spaces)
+
+def save_board(board, path: str):
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.cols':
+        save_columns(board, path)
+        return
+    records = map(space_to_record, board.spaces)
+    with open(path, 'w', encoding='utf-8', newline='') as file:
+        if extension == '.jsonl':
+            for record in records:
+                file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        elif extension == '.csv':
+            writer = csv.writer(file)
+            writer.writerow(CSV_FIELDS)
+            for record in records:
+                writer.writerow(['' if record.get(field) is None else record[field] for field in CSV_FIELDS])
+        elif extension == '.json':
+            json.dump({'spaces': list(records)}, file, ensure_ascii=False, indent=1)
+        else:
+            raise ValueError(f"Formato de tabuleiro não suportado: {extension}.")
+
+def main():
+    parser = argparse.ArgumentParser(description="Carrega ou gera arquivos de tabuleiro.")
+    parser.add_argument("path")
+    parser.add_argument("--generate", type=int, default=None, metavar="CASAS",
+                        help="grava o tabuleiro padrão com esse número de casas em vez de carregar")
+    args = parser.parse_args()
+    if args.generate is not None:
+        save_board(build_default_board(args.generate), args.path)
+        print(f"Tabuleiro com {args.generate} casas gravado em {args.path}")
+        return
+    started = time.perf_counter()
+    board = load_board(args.path)
+    elapsed = time.perf_counter() - started
+    print(f"{len(board.spaces)} casas carregadas em {elapsed:.2f}s")
+
+if __name__ == "__main__":
+    main()
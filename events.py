@@ -0,0 +1,255 @@
+# ====================================
+# Eventos tipados e barramento de eventos
+# ====================================
+# Cada evento guarda apenas as referências necessárias; a mensagem em texto
+# só é formatada quando algum assinante chama message().
+
+import sys
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass
+
+class GameEvent(ABC):
+    __slots__ = ()
+
+    @abstractmethod
+    def message(self) -> str:
+        pass
+
+    def __str__(self):
+        return self.message()
+
+@dataclass(slots=True)
+class Message(GameEvent):
+    text: str
+
+    def message(self):
+        return self.text
+
+@dataclass(slots=True)
+class GameStarted(GameEvent):
+    def message(self):
+        return "Iniciando o jogo."
+
+@dataclass(slots=True)
+class TurnStarted(GameEvent):
+    player: object
+
+    def message(self):
+        return f"É a vez de {self.player.name}."
+
+@dataclass(slots=True)
+class DiceRolled(GameEvent):
+    player: object
+    dice_values: list
+
+    def message(self):
+        return f"{self.player.name} rolou os dados: {self.dice_values} totalizando {sum(self.dice_values)}."
+
+@dataclass(slots=True)
+class PassedStart(GameEvent):
+    player: object
+    amount: int
+
+    def message(self):
+        return f"{self.player.name} passou pelo Ponto de Partida e recebeu {self.amount}."
+
+@dataclass(slots=True)
+class LandedOnSpace(GameEvent):
+    player: object
+    space: object
+
+    def message(self):
+        space = self.space
+        if space.kind == 'property':
+            return f"{self.player.name} caiu em {space.name} (Imóvel). Preço: {space.price}, Aluguel: {space.rent}."
+        if space.kind == 'company':
+            return f"{self.player.name} caiu na {space.name} (Empresa). Preço: {space.price}, Taxa Base: {space.base_fee}."
+        return f"{self.player.name} caiu em {space.name} (Lugar Especial)."
+
+@dataclass(slots=True)
+class LandedOnOwnSpace(GameEvent):
+    player: object
+    space: object
+
+    def message(self):
+        if self.space.kind == 'company':
+            return f"{self.player.name} caiu em sua própria empresa {self.space.name}."
+        return f"{self.player.name} caiu em seu próprio imóvel {self.space.name}."
+
+@dataclass(slots=True)
+class RentDue(GameEvent):
+    player: object
+    space: object
+    owner: object
+    amount: int
+
+    def message(self):
+        if self.space.kind == 'company':
+            return (f"{self.player.name} caiu na {self.space.name}, que pertence a {self.owner.name}. "
+                    f"Deve pagar taxa de {self.amount}.")
+        return (f"{self.player.name} caiu em {self.space.name}, que pertence a {self.owner.name}. "
+                f"Deve pagar aluguel de {self.amount}.")
+
+@dataclass(slots=True)
+class RentPaid(GameEvent):
+    player: object
+    owner: object
+    space: object
+    amount: int
+
+    def message(self):
+        return f"{self.player.name} pagou {self.amount} a {self.owner.name}."
+
+@dataclass(slots=True)
+class Purchased(GameEvent):
+    player: object
+    space: object
+
+    def message(self):
+        return f"{self.player.name} comprou {self.space.name} por {self.space.price}."
+
+@dataclass(slots=True)
+class InsufficientFunds(GameEvent):
+    player: object
+    space: object
+
+    def message(self):
+        return f"{self.player.name} não tem saldo suficiente para comprar {self.space.name}."
+
+@dataclass(slots=True)
+class PurchaseDeclined(GameEvent):
+    player: object
+    space: object
+
+    def message(self):
+        return f"{self.player.name} optou por não comprar {self.space.name}."
+
+@dataclass(slots=True)
+class BonusReceived(GameEvent):
+    player: object
+    amount: int
+
+    def message(self):
+        return f"{self.player.name} recebe um bônus de {self.amount}."
+
+@dataclass(slots=True)
+class PenaltyApplied(GameEvent):
+    player: object
+    amount: int
+
+    def message(self):
+        return f"{self.player.name} sofre uma penalidade de {self.amount}."
+
+@dataclass(slots=True)
+class Moved(GameEvent):
+    player: object
+    steps: int
+
+    def message(self):
+        return f"{self.player.name} avança {self.steps} casa(s)."
+
+@dataclass(slots=True)
+class Eliminated(GameEvent):
+    player: object
+
+    def message(self):
+        return f"{self.player.name} foi eliminado!"
+
+@dataclass(slots=True)
+class AssetsReleased(GameEvent):
+    player: object
+    spaces: list
+
+    def message(self):
+        return f"Os logradouros de {self.player.name} voltam ao banco: {', '.join(space.name for space in self.spaces)}."
+
+@dataclass(slots=True)
+class Won(GameEvent):
+    player: object
+
+    def message(self):
+        return f"{self.player.name} é o vencedor!"
+
+# Distribui os eventos apenas para os assinantes interessados no tipo (ou em uma classe base dele)
+class EventBus:
+    def __init__(self):
+        self.subscribers = []  # (handler, tipos ou None para todos)
+        self.dispatch = {}  # tipo de evento -> handlers, montado sob demanda
+
+    def subscribe(self, handler, event_types=None):
+        types = tuple(event_types) if event_types is not None else None
+        self.subscribers.append((handler, types))
+        self.dispatch.clear()
+
+    def unsubscribe(self, handler):
+        self.subscribers = [(h, types) for h, types in self.subscribers if h != handler]
+        self.dispatch.clear()
+
+    def handlers_for(self, event_type):
+        handlers = self.dispatch.get(event_type)
+        if handlers is None:
+            handlers = [h for h, types in self.subscribers if types is None or issubclass(event_type, types)]
+            self.dispatch[event_type] = handlers
+        return handlers
+
+    def wants(self, event_type):
+        return bool(self.handlers_for(event_type))
+
+    def publish(self, event: GameEvent):
+        for handler in self.handlers_for(type(event)):
+            handler(event)
+
+    # Só constrói o evento se houver alguém interessado nele
+    def emit(self, event_type, *args):
+        handlers = self.dispatch.get(event_type)
+        if handlers is None:
+            handlers = self.handlers_for(event_type)
+        if handlers:
+            event = event_type(*args)
+            for handler in handlers:
+                handler(event)
+
+# ====================================
+# Destinos (sinks) de eventos
+# ====================================
+
+# Guarda os últimos eventos; o texto é formatado apenas na leitura
+class RingBufferSink:
+    def __init__(self, capacity: int = 1000):
+        self.events = deque(maxlen=capacity)
+
+    def __call__(self, event: GameEvent):
+        self.events.append(event)
+
+    def messages(self):
+        return [event.message() for event in self.events]
+
+class StdoutSink:
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+
+    def __call__(self, event: GameEvent):
+        print(event.message(), file=self.stream)
+
+# Escreve em arquivo em blocos, sem uma chamada de sistema por evento
+class FileSink:
+    def __init__(self, path: str, buffer_lines: int = 1024):
+        self.file = open(path, 'a', encoding='utf-8')
+        self.buffer = []
+        self.buffer_lines = buffer_lines
+
+    def __call__(self, event: GameEvent):
+        self.buffer.append(event.message())
+        if len(self.buffer) >= self.buffer_lines:
+            self.flush()
+
+    def flush(self):
+        if self.buffer:
+            self.file.write("\n".join(self.buffer) + "\n")
+            self.buffer = []
+        self.file.flush()
+
+    def close(self):
+        self.flush()
+        self.file.close()
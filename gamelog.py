@@ -0,0 +1,167 @@
+# ====================================
+# Log binário da partida (event sourcing) e replay
+# ====================================
+# O log guarda apenas as entradas do jogo: a semente, os jogadores e, para cada
+# turno, um único byte com os dados (6 * (d1 - 1) + (d2 - 1)) e a decisão de
+# compra no bit 0x40. O replay reconstrói o estado exato em qualquer turno.
+
+import argparse
+import hashlib
+import struct
+import time
+
+from app import Game, Player, build_default_board
+from events import DiceRolled, InsufficientFunds, PurchaseDeclined, Purchased
+
+MAGIC = b'JTLG'
+VERSION = 1
+HEADER = struct.Struct('<4sBQi8sB')  # magic, versão, semente, bônus de partida, digest do tabuleiro, nº de jogadores
+PLAYER = struct.Struct('<iH')  # saldo inicial, tamanho do nome
+BUY_FLAG = 0x40
+
+def board_digest(board):
+    digest = hashlib.sha1()
+    for space in board.spaces:
+        effect = getattr(space, 'effect', None)
+        strategy = getattr(space, 'fee_strategy', None)
+        digest.update(repr((space.kind, space.name, getattr(space, 'price', None), getattr(space, 'rent', None),
+                            getattr(space, 'base_fee', None), type(strategy).__name__ if strategy else None,
+                            getattr(effect, '__name__', None), getattr(effect, 'steps', None))).encode())
+    return digest.digest()[:8]
+
+def encode_turn(dice_values, bought: bool):
+    d1, d2 = dice_values
+    return 6 * (d1 - 1) + (d2 - 1) | (BUY_FLAG if bought else 0)
+
+def decode_turn(code: int):
+    dice = code & ~BUY_FLAG
+    return [dice // 6 + 1, dice % 6 + 1], bool(code & BUY_FLAG)
+
+# Grava o log assinando os eventos de dados e de decisão de compra do jogo
+class GameRecorder:
+    def __init__(self, game: Game, path: str, initial_balances=None):
+        # random.Random usa o valor absoluto de sementes inteiras: gravar abs(seed) reproduz os mesmos dados
+        seed = abs(game.seed)
+        if seed >= 1 << 64:
+            raise ValueError("A semente da partida não cabe no log (64 bits).")
+        balances = initial_balances or [player.balance for player in game.roster]
+        self.file = open(path, 'wb')
+        self.file.write(HEADER.pack(MAGIC, VERSION, seed, game.starting_bonus, board_digest(game.board),
+                                    len(game.roster)))
+        for player, balance in zip(game.roster, balances):
+            name = player.name.encode('utf-8')
+            self.file.write(PLAYER.pack(balance, len(name)) + name)
+        self.pending = None  # Turno em andamento: dados e decisão ainda não gravados
+        self.buffer = bytearray()
+        game.add_sink(self.on_dice, [DiceRolled])
+        game.add_sink(self.on_decision, [Purchased, InsufficientFunds, PurchaseDeclined])
+
+    def on_dice(self, event: DiceRolled):
+        self.flush_turn()
+        self.pending = [event.dice_values, False]
+
+    def on_decision(self, event):
+        if self.pending is not None:
+            self.pending[1] = not isinstance(event, PurchaseDeclined)
+
+    def flush_turn(self):
+        if self.pending is not None:
+            self.buffer.append(encode_turn(*self.pending))
+            self.pending = None
+            if len(self.buffer) >= 4096:
+                self.flush()
+
+    def flush(self):
+        self.file.write(self.buffer)
+        self.buffer.clear()
+        self.file.flush()
+
+    def close(self):
+        self.flush_turn()
+        self.flush()
+        self.file.close()
+
+class GameLog:
+    def __init__(self, seed, starting_bonus, digest, players, turns: bytes):
+        self.seed = seed
+        self.starting_bonus = starting_bonus
+        self.digest = digest
+        self.players = players  # [(nome, saldo inicial)]
+        self.turns = turns
+
+    @classmethod
+    def read(cls, path: str):
+        with open(path, 'rb') as file:
+            data = file.read()
+        magic, version, seed, starting_bonus, digest, num_players = HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Arquivo de log inválido.")
+        offset = HEADER.size
+        players = []
+        for _ in range(num_players):
+            balance, size = PLAYER.unpack_from(data, offset)
+            offset += PLAYER.size
+            players.append((data[offset:offset + size].decode('utf-8'), balance))
+            offset += size
+        return cls(seed, starting_bonus, digest, players, data[offset:])
+
+# Reconstrói o Game em qualquer turno, com snapshots periódicos para saltar direto ao ponto mais próximo
+class GameReplayer:
+    def __init__(self, log: GameLog, board_factory=build_default_board, snapshot_interval: int = 256):
+        self.log = log
+        self.board_factory = board_factory
+        self.snapshot_interval = snapshot_interval
+        self.snapshots = [None]  # snapshots[k] = estado após k * snapshot_interval turnos
+        self.num_turns = len(log.turns)
+
+    def new_game(self):
+        board = self.board_factory()
+        if board_digest(board) != self.log.digest:
+            raise ValueError("O tabuleiro não corresponde ao do log.")
+        players = [Player(name, balance) for name, balance in self.log.players]
+        return Game(board, players, self.log.starting_bonus, seed=self.log.seed)
+
+    def replay_turn(self, game: Game, code: int):
+        dice_values, bought = decode_turn(code)
+        if game.roll_dice() != dice_values:
+            raise ValueError("Os dados do log não correspondem à semente da partida.")
+        game.purchase_callback = lambda player, space: bought
+        game.play_turn(game.start_turn(), dice_values)
+
+    def game_at(self, turn: int):
+        turn = min(max(turn, 0), self.num_turns)
+        k = min(turn // self.snapshot_interval, len(self.snapshots) - 1)
+        game = self.new_game()
+        if self.snapshots[k] is not None:
+            game.restore(self.snapshots[k])
+        turns = self.log.turns
+        for t in range(k * self.snapshot_interval, turn):
+            if not game.active:
+                break
+            self.replay_turn(game, turns[t])
+            if (t + 1) % self.snapshot_interval == 0 and (t + 1) // self.snapshot_interval == len(self.snapshots):
+                self.snapshots.append(game.snapshot())
+        return game
+
+def main():
+    parser = argparse.ArgumentParser(description="Reconstrói uma partida gravada em qualquer turno.")
+    parser.add_argument("log")
+    parser.add_argument("--turn", type=int, default=None, help="turno desejado (padrão: o último)")
+    parser.add_argument("--board", default=None, help="arquivo do tabuleiro da partida (padrão: o tabuleiro padrão)")
+    args = parser.parse_args()
+    log = GameLog.read(args.log)
+    if args.board:
+        from board_loader import load_board
+        replayer = GameReplayer(log, lambda: load_board(args.board))
+    else:
+        replayer = GameReplayer(log)
+    started = time.perf_counter()
+    game = replayer.game_at(args.turn if args.turn is not None else replayer.num_turns)
+    elapsed = time.perf_counter() - started
+    print(f"Turnos no log: {replayer.num_turns} ({len(log.turns)} bytes); replay em {elapsed * 1000:.1f} ms")
+    for player in game.roster:
+        status = "ativo" if game.is_alive(player) else "eliminado"
+        print(f"{player.name}: saldo {player.balance}, posição {player.position % len(game.board.spaces)} ({status})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+# ====================================
+# Histórico colunar da partida, gravado em blocos e lido por mmap
+# ====================================
+# O HistoryRecorder assina os eventos do Game e acumula, por turno, colunas
+# tipadas (array): turno, jogador, dados, posição e saldo ao fim do turno.
+# As trocas de dono das casas vão para uma segunda tabela (turno, casa, dono).
+# A cada bloco de turnos as colunas são anexadas a um arquivo por coluna; o
+# HistoryStore abre esses arquivos com mmap e expõe memoryviews tipadas, sem
+# copiar os dados (ou arrays NumPy com np.frombuffer, se disponível).
+
+import argparse
+import json
+import mmap
+import os
+from array import array
+
+from events import AssetsReleased, DiceRolled, Purchased, TurnStarted, Won
+
+# Nome da coluna -> código de tipo do array (ordem de bytes nativa)
+TURN_COLUMNS = {'turn': 'i', 'player': 'h', 'dice1': 'b', 'dice2': 'b', 'position': 'q', 'balance': 'q'}
+OWNER_COLUMNS = {'owner_turn': 'i', 'owner_space': 'i', 'owner_player': 'h'}  # owner_player -1 = banco
+COLUMNS = {**TURN_COLUMNS, **OWNER_COLUMNS}
+META_FILE = "meta.json"
+
+class HistoryRecorder:
+    def __init__(self, game, directory: str, chunk_turns: int = 65536):
+        self.directory = directory
+        self.chunk_turns = chunk_turns
+        self.columns = {name: array(code) for name, code in COLUMNS.items()}
+        self.turn = 0
+        self.flushed = 0  # Turnos completos já anexados aos arquivos
+        self.pending = None  # Jogador do turno em andamento (posição e saldo gravados no fim do turno)
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, META_FILE), 'w', encoding='utf-8') as file:
+            json.dump({'columns': COLUMNS, 'players': [p.name for p in game.roster],
+                       'spaces': [space.name for space in game.board.spaces]}, file, ensure_ascii=False)
+        self.files = {name: open(os.path.join(directory, f"{name}.col"), 'wb') for name in COLUMNS}
+        self.attach(game)
+
+    # Passa a gravar outro jogo (com o mesmo tabuleiro e jogadores) na sequência do mesmo histórico
+    def attach(self, game):
+        self.finish_turn()
+        self.game = game
+        self.roster_index = {id(player): i for i, player in enumerate(game.roster)}
+        game.add_sink(self.on_dice, [DiceRolled])
+        game.add_sink(self.on_turn_over, [TurnStarted, Won])  # Fecha a linha assim que o turno termina
+        game.add_sink(self.on_purchase, [Purchased])
+        game.add_sink(self.on_release, [AssetsReleased])
+
+    def on_dice(self, event: DiceRolled):
+        self.finish_turn()
+        columns = self.columns
+        self.turn += 1
+        self.pending = event.player
+        columns['turn'].append(self.turn)
+        columns['player'].append(self.roster_index[id(event.player)])
+        columns['dice1'].append(event.dice_values[0])
+        columns['dice2'].append(event.dice_values[1])
+
+    def on_turn_over(self, event):
+        self.finish_turn()
+
+    def finish_turn(self):
+        player = self.pending
+        if player is not None:
+            self.pending = None
+            self.columns['position'].append(player.position)
+            self.columns['balance'].append(player.balance)
+            if len(self.columns['position']) >= self.chunk_turns:
+                self.flush()
+
+    def record_owner(self, space, owner: int):
+        columns = self.columns
+        columns['owner_turn'].append(self.turn)
+        columns['owner_space'].append(self.game.board.index_of(space))
+        columns['owner_player'].append(owner)
+
+    def on_purchase(self, event: Purchased):
+        self.record_owner(event.space, self.roster_index[id(event.player)])
+
+    def on_release(self, event: AssetsReleased):
+        for space in event.spaces:
+            self.record_owner(space, -1)
+
+    # Anexa os turnos completos aos arquivos; o turno em andamento fica para o próximo bloco
+    def flush(self):
+        columns = self.columns
+        complete = len(columns['position'])
+        for name in COLUMNS:
+            column = columns[name]
+            count = complete if name in TURN_COLUMNS else len(column)
+            column[:count].tofile(self.files[name])
+            del column[:count]
+            self.files[name].flush()
+        self.flushed += complete
+
+    # Turnos completos gravados até agora (nos arquivos e no bloco em memória)
+    def __len__(self):
+        return self.flushed + len(self.columns['position'])
+
+    # Linhas [start, stop) da tabela de turnos, durante a gravação (janela do log da interface)
+    def rows(self, start: int, stop: int):
+        stop = min(stop, len(self))
+        start = max(0, min(start, stop))
+        flushed = self.flushed
+        columns = []
+        for name, code in TURN_COLUMNS.items():
+            values = array(code)
+            if start < flushed:
+                with open(os.path.join(self.directory, f"{name}.col"), 'rb') as file:
+                    file.seek(start * values.itemsize)
+                    values.fromfile(file, min(stop, flushed) - start)
+            values.extend(self.columns[name][max(start - flushed, 0):max(stop - flushed, 0)])
+            columns.append(values)
+        return list(zip(*columns))
+
+    def close(self):
+        self.finish_turn()
+        self.flush()
+        for file in self.files.values():
+            file.close()
+
+# Leitura sem cópia: cada coluna é uma memoryview tipada sobre o arquivo mapeado
+class HistoryStore:
+    def __init__(self, directory: str):
+        with open(os.path.join(directory, META_FILE), encoding='utf-8') as file:
+            meta = json.load(file)
+        self.players = meta['players']
+        self.spaces = meta['spaces']
+        self.maps = {}
+        self.views = {}
+        for name, code in meta['columns'].items():
+            with open(os.path.join(directory, f"{name}.col"), 'rb') as file:
+                size = os.fstat(file.fileno()).st_size
+                if size == 0:  # mmap não aceita arquivos vazios
+                    self.views[name] = memoryview(array(code))
+                    continue
+                self.maps[name] = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            self.views[name] = memoryview(self.maps[name]).cast(code)
+
+    def __len__(self):
+        return len(self.views['turn'])
+
+    def column(self, name: str):
+        return self.views[name]
+
+    def numpy(self, name: str):
+        import numpy as np
+        return np.frombuffer(self.views[name], dtype=np.dtype(self.views[name].format))
+
+    def row(self, index: int):
+        return {name: self.views[name][index] for name in TURN_COLUMNS}
+
+    def owner_changes(self):
+        return zip(self.views['owner_turn'], self.views['owner_space'], self.views['owner_player'])
+
+    def close(self):
+        for view in self.views.values():
+            view.release()
+        for mapped in self.maps.values():
+            mapped.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Resumo de um histórico colunar gravado.")
+    parser.add_argument("directory")
+    parser.add_argument("--record", type=int, default=None, metavar="PARTIDAS",
+                        help="grava antes o histórico dessa quantidade de partidas sem interface")
+    parser.add_argument("--max-turns", type=int, default=1000)
+    args = parser.parse_args()
+    if args.record:
+        import time
+        from app import Game, build_default_board
+        from simulation import HeadlessRunner, game_seed, make_players
+        started = time.perf_counter()
+        recorder = None
+        for game_index in range(args.record):
+            game = Game(build_default_board(), make_players(2), seed=game_seed(0, game_index))
+            if recorder is None:
+                recorder = HistoryRecorder(game, args.directory)
+            else:
+                recorder.attach(game)
+            HeadlessRunner(game, max_turns=args.max_turns).run()
+        recorder.close()
+        print(f"Gravação: {time.perf_counter() - started:.2f}s")
+
+    store = HistoryStore(args.directory)
+    turns = len(store)
+    print(f"Turnos: {turns}; trocas de dono: {len(store.column('owner_turn'))}")
+    if turns:
+        players, balances = store.column('player'), store.column('balance')
+        totals = [0] * len(store.players)
+        counts = [0] * len(store.players)
+        for player, balance in zip(players, balances):
+            totals[player] += balance
+            counts[player] += 1
+        for i, name in enumerate(store.players):
+            if counts[i]:
+                print(f"{name}: {counts[i]} turnos, saldo médio {totals[i] / counts[i]:.1f}")
+    store.close()
+
+if __name__ == "__main__":
+    main()
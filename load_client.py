@@ -0,0 +1,141 @@
+# ====================================
+# Gerador de carga para o servidor de partidas (server.py)
+# ====================================
+# Abre um conjunto de conexões, cria N sessões distribuídas entre elas e joga
+# turnos em todas ao mesmo tempo, medindo a latência de cada pedido (do envio
+# até a resposta com o mesmo id). Mostra p50/p95/p99 para cada número de sessões.
+
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import random
+import time
+
+from server import GameServer, encode
+
+def percentile(sorted_values, fraction: float):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+class LoadConnection:
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.ids = itertools.count(1)
+        self.waiting = {}  # id do pedido -> future da resposta
+        self.events = 0
+        self.listener = asyncio.ensure_future(self.listen())
+
+    async def listen(self):
+        try:
+            while True:
+                line = await self.reader.readline()
+                if not line:
+                    break
+                message = json.loads(line)
+                if message.get('type') == 'event':
+                    self.events += 1
+                    continue
+                future = self.waiting.pop(message.get('id'), None)
+                if future is not None and not future.done():
+                    future.set_result(message)
+        finally:
+            for future in self.waiting.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("Conexão encerrada pelo servidor."))
+
+    async def request(self, message: dict):
+        request_id = next(self.ids)
+        future = asyncio.get_running_loop().create_future()
+        self.waiting[request_id] = future
+        self.writer.write(encode(dict(message, id=request_id)))
+        await self.writer.drain()
+        reply = await future
+        if reply.get('type') == 'error':
+            raise RuntimeError(reply['message'])
+        return reply
+
+    # Fecha o envio e espera o servidor encerrar a conexão do lado dele
+    async def close(self):
+        self.writer.write_eof()
+        await self.listener
+        self.writer.close()
+
+# Joga até "turns" turnos em uma sessão (recria a partida quando ela termina)
+async def play_session(connection: LoadConnection, seed: int, turns: int, buy_probability: float, latencies):
+    rng = random.Random(seed)
+    session = None
+    for turn in range(turns):
+        if session is None:
+            reply = await connection.request({'op': 'create', 'players': ["Jogador 1", "Jogador 2"],
+                                              'seed': seed * 1000 + turn})
+            session = reply['session']
+        started = time.perf_counter()
+        reply = await connection.request({'op': 'roll', 'session': session})
+        latencies.append(time.perf_counter() - started)
+        if 'offer' in reply:
+            started = time.perf_counter()
+            await connection.request({'op': 'purchase', 'session': session, 'buy': rng.random() < buy_probability})
+            latencies.append(time.perf_counter() - started)
+        state = await connection.request({'op': 'state', 'session': session})
+        if not state['active']:
+            await connection.request({'op': 'close', 'session': session})
+            session = None
+
+async def run_load(host: str, port: int, sessions: int, connections: int, turns: int, buy_probability: float):
+    links = []
+    for _ in range(min(connections, sessions)):
+        reader, writer = await asyncio.open_connection(host, port, limit=1 << 16)
+        links.append(LoadConnection(reader, writer))
+    latencies = []
+    started = time.perf_counter()
+    await asyncio.gather(*(play_session(links[i % len(links)], i, turns, buy_probability, latencies)
+                           for i in range(sessions)))
+    elapsed = time.perf_counter() - started
+    events = sum(link.events for link in links)
+    for link in links:
+        await link.close()
+    latencies.sort()
+    return {
+        'sessions': sessions,
+        'requests': len(latencies),
+        'requests_per_second': len(latencies) / elapsed if elapsed > 0 else float('inf'),
+        'events': events,
+        'p50_ms': percentile(latencies, 0.50) * 1000,
+        'p95_ms': percentile(latencies, 0.95) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+    }
+
+async def run_all(args):
+    host, port, server = args.host, args.port, None
+    if args.embedded:  # Servidor no mesmo processo, em porta livre
+        server = await asyncio.start_server(GameServer().serve_client, '127.0.0.1', 0, limit=1 << 16)
+        host, port = server.sockets[0].getsockname()[:2]
+    try:
+        for sessions in args.sessions:
+            result = await run_load(host, port, sessions, args.connections, args.turns, args.buy_probability)
+            print(f"{result['sessions']:>6} sessões: {result['requests']} pedidos "
+                  f"({result['requests_per_second']:.0f}/s, {result['events']} eventos)  "
+                  f"p50 {result['p50_ms']:.2f} ms  p95 {result['p95_ms']:.2f} ms  p99 {result['p99_ms']:.2f} ms")
+    finally:
+        if server is not None:
+            server.close()
+            await server.wait_closed()
+
+def main():
+    parser = argparse.ArgumentParser(description="Gerador de carga para o servidor de partidas.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--sessions", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--connections", type=int, default=50, help="conexões TCP compartilhadas pelas sessões")
+    parser.add_argument("--turns", type=int, default=50, help="turnos jogados por sessão")
+    parser.add_argument("--buy-probability", type=float, default=0.7)
+    parser.add_argument("--embedded", action="store_true", help="sobe o servidor no mesmo processo")
+    asyncio.run(run_all(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
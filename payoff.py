@@ -0,0 +1,207 @@
+# ====================================
+# Tabelas de pagamento pré-compiladas e resolvedor de turnos por tabela
+# ====================================
+# O compilador transforma cada casa em um código de operação e uma linha de
+# pagamentos indexada pela soma dos dados (2 a 12); os efeitos de movimento
+# viram deslocamentos de salto. O TableEngine joga a partida só com listas de
+# inteiros (posições, saldos, donos), sem despachar landed_on nem FeeStrategy,
+# e consome o gerador exatamente como Game.roll_dice: o resultado é idêntico ao
+# do motor de objetos com a política padrão (sempre compra).
+
+import argparse
+import random
+
+from app import (BONUS_AMOUNT, PENALTY_AMOUNT, Company, FixedFeeStrategy, Game, Property, SpecialPlace, TurnOrder,
+                 VariableFeeStrategy, bonus_effect, build_default_board, no_effect, penalty_effect)
+
+# Códigos de cada tipo de logradouro na tabela compilada
+OP_NOP, OP_PROPERTY, OP_FIXED_FEE, OP_VARIABLE_FEE, OP_BONUS, OP_PENALTY, OP_MOVE = range(7)
+
+class PayoffTables:
+    def __init__(self, opcode, price, fee, payoff, jump):
+        self.opcode = opcode
+        self.price = price
+        self.fee = fee  # Aluguel do imóvel ou taxa base da empresa
+        self.payoff = payoff  # payoff[i][soma]: valor pago ao dono (ou bônus/penalidade) com essa soma dos dados
+        self.jump = jump  # Deslocamento dos efeitos de movimento
+        self.num_spaces = len(opcode)
+
+def compile_tables(board):
+    opcode, price, fee, jump, payoff = [], [], [], [], []
+    rows = {}  # Linhas iguais são compartilhadas entre as casas
+
+    def row(values):
+        values = tuple(values)
+        return rows.setdefault(values, values)
+
+    zero = row([0] * 13)
+    for space in board.spaces:
+        op, cost, base, steps, line = OP_NOP, 0, 0, 0, zero
+        if isinstance(space, Property):
+            op, cost, base = OP_PROPERTY, space.price, space.rent
+            line = row([base] * 13)
+        elif isinstance(space, Company):
+            cost, base = space.price, space.base_fee
+            if isinstance(space.fee_strategy, VariableFeeStrategy):
+                op = OP_VARIABLE_FEE
+                line = row([base * total for total in range(13)])
+            elif isinstance(space.fee_strategy, FixedFeeStrategy):
+                op = OP_FIXED_FEE
+                line = row([base] * 13)
+            else:
+                raise ValueError(f"Estratégia de taxa não suportada em {space.name}.")
+        elif isinstance(space, SpecialPlace):
+            if space.effect is no_effect:
+                op = OP_NOP
+            elif space.effect is bonus_effect:
+                op, line = OP_BONUS, row([BONUS_AMOUNT] * 13)
+            elif space.effect is penalty_effect:
+                op, line = OP_PENALTY, row([PENALTY_AMOUNT] * 13)
+            elif getattr(space.effect, 'steps', None) is not None:
+                op, steps = OP_MOVE, space.effect.steps
+            else:
+                raise ValueError(f"Efeito não suportado em {space.name}.")
+        else:
+            raise ValueError(f"Logradouro não suportado: {space.name}.")
+        opcode.append(op)
+        price.append(cost)
+        fee.append(base)
+        jump.append(steps)
+        payoff.append(line)
+    return PayoffTables(opcode, price, fee, payoff, jump)
+
+# Partida inteira em listas de inteiros; jogadores são índices na ordem original
+class TableEngine:
+    def __init__(self, tables: PayoffTables, balances, starting_bonus: int = 100, seed: int = 0, buy=None):
+        self.tables = tables
+        self.position = [0] * len(balances)
+        self.balance = list(balances)
+        self.owner = [-1] * tables.num_spaces  # -1 = banco
+        self.holdings = [[] for _ in balances]  # Casas de cada jogador, na ordem de compra
+        self.order = TurnOrder(len(balances))  # Vivos e jogador da vez, como Game.turn_order
+        self.starting_bonus = starting_bonus
+        self.active = True
+        self.turns = 0
+        self.buy = buy  # buy(jogador, casa, saldo) -> bool; None compra sempre, como o Game sem callback
+        self.seed = seed
+        self.rng = random.Random(seed)
+
+    def eliminate(self, player: int):
+        self.order.remove(player)
+        owner = self.owner
+        for space in self.holdings[player]:
+            owner[space] = -1
+        self.holdings[player] = []
+        if len(self.order) == 1:
+            self.active = False
+
+    @property
+    def players(self):
+        return list(self.order.members())
+
+    def run(self, max_turns: int = 1000):
+        tables = self.tables
+        opcode, price, payoff, jump = tables.opcode, tables.price, tables.payoff, tables.jump
+        num_spaces = tables.num_spaces
+        position, balance, owner, holdings = self.position, self.balance, self.owner, self.holdings
+        order = self.order
+        nxt, alive = order.next, order.alive
+        starting_bonus, buy = self.starting_bonus, self.buy
+        getrandbits = self.rng.getrandbits
+        turns, player = self.turns, order.current
+        while self.active and turns < max_turns:
+            # Mesmos valores e mesmo consumo do gerador que Game.roll_dice:
+            # randint(1, 6) sorteia getrandbits(3) e rejeita 6 e 7
+            d1 = getrandbits(3)
+            while d1 >= 6:
+                d1 = getrandbits(3)
+            d2 = getrandbits(3)
+            while d2 >= 6:
+                d2 = getrandbits(3)
+            total = d1 + d2 + 2
+            prev = position[player]
+            new = prev + total
+            position[player] = new
+            if new // num_spaces > prev // num_spaces:
+                balance[player] += starting_bonus
+            space = new % num_spaces
+            op = opcode[space]
+            if op == OP_PROPERTY or op == OP_FIXED_FEE or op == OP_VARIABLE_FEE:
+                holder = owner[space]
+                if holder < 0:
+                    if (buy is None or buy(player, space, balance[player])) and balance[player] >= price[space]:
+                        balance[player] -= price[space]
+                        owner[space] = player
+                        holdings[player].append(space)
+                elif holder != player:
+                    amount = payoff[space][total]
+                    if balance[player] >= amount:
+                        balance[player] -= amount
+                        balance[holder] += amount
+                    else:
+                        self.eliminate(player)
+            elif op == OP_MOVE:
+                position[player] += jump[space]
+            elif op == OP_BONUS:
+                balance[player] += payoff[space][total]
+            elif op == OP_PENALTY:
+                balance[player] -= payoff[space][total]
+                if balance[player] < 0:
+                    self.eliminate(player)
+            turns += 1
+            if self.active:  # TurnOrder.advance, sem a chamada de método
+                player = nxt[player]
+                while not alive[player]:
+                    player = nxt[player]
+        self.turns, order.current = turns, player
+        return self
+
+    @property
+    def winner(self):
+        return None if self.active else self.order.after(self.order.current)
+
+# Compara o motor por tabela com o Game (HeadlessRunner) partida a partida; devolve as sementes divergentes
+def verify(num_games: int = 1000, seed: int = 0, num_players: int = 2, max_turns: int = 1000,
+           board_factory=build_default_board):
+    from simulation import HeadlessRunner, game_seed, make_players
+    tables = compile_tables(board_factory())
+    mismatches = []
+    for game_index in range(num_games):
+        game_seed_value = game_seed(seed, game_index)
+        game = Game(board_factory(), make_players(num_players), seed=game_seed_value)
+        players = game.roster
+        result = HeadlessRunner(game, max_turns=max_turns).run()
+        engine = TableEngine(tables, [p.balance for p in make_players(num_players)], game.starting_bonus,
+                             game_seed_value).run(max_turns)
+        spaces = game.board.spaces
+        expected = (result.turns, [p.position for p in players], [p.balance for p in players],
+                    [players.index(s.owner) if getattr(s, 'owner', None) else -1 for s in spaces],
+                    game.turn_order.members(), game.turn_order.current)
+        actual = (engine.turns, engine.position, engine.balance, engine.owner, engine.order.members(),
+                  engine.order.current)
+        if expected != actual:
+            mismatches.append(game_seed_value)
+    return mismatches
+
+def main():
+    parser = argparse.ArgumentParser(description="Motor por tabelas de pagamento: verificação e desempenho.")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--players", type=int, default=2)
+    parser.add_argument("--max-turns", type=int, default=1000)
+    args = parser.parse_args()
+    mismatches = verify(args.games, args.seed, args.players, args.max_turns)
+    print(f"Partidas divergentes do motor de objetos: {len(mismatches)} de {args.games}")
+
+    from simulation import run_batch
+    timings = {}
+    for engine in ('objetos', 'tabelas'):
+        summary = run_batch(args.games, workers=1, seed=args.seed, num_players=args.players,
+                            max_turns=args.max_turns, engine=engine)
+        timings[engine] = sum(summary['lengths']) / summary['elapsed']
+        print(f"Motor de {engine}: {timings[engine]:.0f} turnos/s")
+    print(f"Aceleração: {timings['tabelas'] / timings['objetos']:.1f}x")
+    raise SystemExit(1 if mismatches else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+# ====================================
+# Instrumentação opcional das fases do turno
+# ====================================
+# Com um Profiler anexado (Profiler.attach), o Game mede cada fase do turno:
+# movimento, bônus de volta, landed_on, decisão de compra, a entrega de cada
+# evento a cada observer/sink e o redesenho da interface. Os tempos vão para
+# histogramas em escala log2 e podem ser exportados em JSON ou no formato de
+# pilhas "dobradas" (folded) aceito por flamegraph.pl e speedscope.
+# Sem profiler, o custo é uma comparação com None por fase.
+
+import argparse
+import json
+import sys
+import time
+
+perf_counter_ns = time.perf_counter_ns
+
+class Histogram:
+    BUCKETS = 64  # bucket k: durações em [2^(k-1), 2^k) ns
+
+    def __init__(self):
+        self.buckets = [0] * self.BUCKETS
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+
+    def add(self, ns: int):
+        self.buckets[min(ns.bit_length(), self.BUCKETS - 1)] += 1
+        self.count += 1
+        self.total += ns
+        if self.min is None or ns < self.min:
+            self.min = ns
+        if ns > self.max:
+            self.max = ns
+
+    # Percentil aproximado pelo limite superior do bucket
+    def percentile(self, fraction: float):
+        target = fraction * self.count
+        seen = 0
+        for k, amount in enumerate(self.buckets):
+            seen += amount
+            if amount and seen >= target:
+                return min(1 << k, self.max)
+        return self.max
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'total_ms': self.total / 1e6,
+            'mean_us': self.total / self.count / 1e3 if self.count else 0.0,
+            'min_us': (self.min or 0) / 1e3,
+            'p50_us': self.percentile(0.5) / 1e3,
+            'p99_us': self.percentile(0.99) / 1e3,
+            'max_us': self.max / 1e3,
+            'buckets': {f"<{1 << k}ns": amount for k, amount in enumerate(self.buckets) if amount},
+        }
+
+def handler_name(handler):
+    owner = getattr(handler, '__self__', None)
+    if owner is not None:  # Método de um observer (ex.: GameUI.update)
+        return type(owner).__name__
+    return getattr(handler, '__qualname__', None) or type(handler).__name__
+
+class Profiler:
+    def __init__(self):
+        self.histograms = {}  # Nome da fase -> Histogram (tempo inclusivo)
+        self.counters = {}
+        self.folded = {}  # Pilha "a;b;c" -> tempo exclusivo em ns
+        self.stack = []  # [nome, início, tempo dos filhos]
+
+    def begin(self, name: str):
+        self.stack.append([name, perf_counter_ns(), 0])
+
+    def end(self):
+        name, started, children = self.stack.pop()
+        elapsed = perf_counter_ns() - started
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram()
+        histogram.add(elapsed)
+        path = ';'.join([frame[0] for frame in self.stack] + [name])
+        self.folded[path] = self.folded.get(path, 0) + elapsed - children
+        if self.stack:
+            self.stack[-1][2] += elapsed
+
+    def count(self, name: str, amount: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    # Substitui o emit/publish do jogo por versões que medem cada handler
+    def attach(self, game):
+        bus = game.events
+        profiler = self
+
+        def deliver(event):
+            profiler.count(f"eventos.{type(event).__name__}")
+            handlers = bus.handlers_for(type(event))
+            if not handlers:
+                return
+            profiler.begin('eventos')
+            for handler in handlers:
+                profiler.begin(handler_name(handler))
+                handler(event)
+                profiler.end()
+            profiler.end()
+
+        def emit(event_type, *args):
+            if bus.handlers_for(event_type):
+                deliver(event_type(*args))
+            else:
+                profiler.count(f"eventos.{event_type.__name__}")
+
+        game.profiler = self
+        game.emit = emit
+        bus.publish = deliver
+        return self
+
+    def detach(self, game):
+        game.profiler = None
+        game.emit = game.events.emit
+        game.events.__dict__.pop('publish', None)
+
+    def to_dict(self):
+        return {
+            'phases': {name: histogram.to_dict() for name, histogram in sorted(self.histograms.items())},
+            'counters': dict(sorted(self.counters.items())),
+        }
+
+    def write_json(self, stream):
+        json.dump(self.to_dict(), stream, indent=2, ensure_ascii=False)
+        stream.write("\n")
+
+    # Uma linha por pilha com o tempo exclusivo em microssegundos (flamegraph.pl / speedscope)
+    def write_folded(self, stream):
+        for path, ns in sorted(self.folded.items()):
+            if ns >= 1000:
+                stream.write(f"{path} {ns // 1000}\n")
+
+    def save(self, path: str):
+        with open(path, 'w', encoding='utf-8') as file:
+            if path.endswith('.folded'):
+                self.write_folded(file)
+            else:
+                self.write_json(file)
+
+def main():
+    from app import Game, build_default_board
+    from events import RingBufferSink
+    from simulation import HeadlessRunner, game_seed, make_players
+
+    parser = argparse.ArgumentParser(description="Perfil das fases do turno em partidas sem interface.")
+    parser.add_argument("--games", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--players", type=int, default=2)
+    parser.add_argument("--max-turns", type=int, default=1000)
+    parser.add_argument("--sinks", type=int, default=1, help="sinks de memória por partida (exercitam a entrega de eventos)")
+    parser.add_argument("--format", choices=("json", "folded"), default="json")
+    parser.add_argument("--output", default=None, help="arquivo de saída (padrão: stdout)")
+    args = parser.parse_args()
+
+    profiler = Profiler()
+    for game_index in range(args.games):
+        game = Game(build_default_board(), make_players(args.players), seed=game_seed(args.seed, game_index))
+        for _ in range(args.sinks):
+            game.add_sink(RingBufferSink(100))
+        profiler.attach(game)
+        HeadlessRunner(game, max_turns=args.max_turns).run()
+    stream = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    try:
+        (profiler.write_folded if args.format == 'folded' else profiler.write_json)(stream)
+    finally:
+        if args.output:
+            stream.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+# ====================================
+# Servidor asyncio com muitas partidas simultâneas
+# ====================================
+# Protocolo: uma mensagem JSON por linha, em TCP. O cliente cria ou acompanha
+# sessões e envia pedidos de jogada; cada pedido recebe uma resposta com o mesmo
+# "id", e os eventos da partida são enviados como deltas a todos os inscritos.
+#
+#   {"id": 1, "op": "create", "players": ["Ana", "Bia"], "seed": 7}
+#   {"id": 2, "op": "roll", "session": 1}            -> {"type": "reply", "id": 2, "offer": {...}} ou "ok"
+#   {"id": 3, "op": "purchase", "session": 1, "buy": true}
+#   {"id": 4, "op": "watch", "session": 1} / {"op": "unwatch", ...} / {"op": "close", ...}
+#
+# Qualquer conexão pode acompanhar uma sessão, mas só a que a criou joga
+# (roll/purchase) e a encerra.
+#
+# Cada conexão tem uma fila de saída limitada; um cliente lento que deixa a
+# fila encher é desconectado, para não atrasar as demais partidas.
+
+import argparse
+import asyncio
+import itertools
+import json
+
+from app import Game, Observer, Player, build_default_board
+
+QUEUE_SIZE = 1024  # Mensagens pendentes por conexão antes de desconectar o cliente
+
+class ProtocolError(Exception):
+    pass
+
+# bool é subclasse de int, mas true/false não são valores válidos para esses campos
+def is_int(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+def encode(message: dict):
+    return (json.dumps(message, ensure_ascii=False, separators=(',', ':')) + '\n').encode('utf-8')
+
+class Connection:
+    def __init__(self, writer, queue_size: int = QUEUE_SIZE):
+        self.writer = writer
+        self.queue = asyncio.Queue(queue_size)
+        self.sessions = set()  # Sessões acompanhadas
+        self.owned = set()  # Sessões criadas por esta conexão (encerradas ao desconectar)
+        self.closed = False
+        self.overflowed = False  # Desconectado por não consumir as mensagens a tempo
+
+    def send(self, data: bytes):
+        if self.closed:
+            return
+        try:
+            self.queue.put_nowait(data)
+        except asyncio.QueueFull:
+            self.overflowed = True
+            self.close()
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self.writer.close()
+
+    # Esvazia a fila respeitando o controle de fluxo do TCP (drain)
+    async def pump(self):
+        try:
+            while not self.closed:
+                data = await self.queue.get()
+                self.writer.write(data)
+                while not self.queue.empty() and not self.closed:
+                    self.writer.write(self.queue.get_nowait())
+                await self.writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self.close()
+
+# Observer da partida: converte cada evento em um delta e o envia aos inscritos da sessão
+class SessionObserver(Observer):
+    def __init__(self, session):
+        self.session = session
+
+    def player_state(self, player):
+        return {'name': player.name, 'position': player.position % len(self.session.game.board.spaces),
+                'balance': player.balance}
+
+    def update(self, event):
+        subscribers = self.session.subscribers
+        if not subscribers:
+            return
+        delta = {'type': 'event', 'session': self.session.id, 'event': type(event).__name__, 'text': str(event)}
+        players = [getattr(event, attr, None) for attr in ('player', 'owner')]
+        delta['players'] = [self.player_state(p) for p in players if isinstance(p, Player)]
+        data = encode(delta)
+        for connection in list(subscribers):
+            connection.send(data)
+
+class Session:
+    def __init__(self, session_id: int, game: Game, owner: Connection = None):
+        self.id = session_id
+        self.game = game
+        self.owner = owner  # Conexão que criou a sessão
+        self.subscribers = set()
+        self.pending = None  # Turno aguardando decisão de compra: (jogador, dados)
+        self.decision = False
+        game.purchase_callback = lambda player, space: self.decision
+        game.add_observer(SessionObserver(self))
+
+    def state(self):
+        game = self.game
+        return {
+            'session': self.id,
+            'active': game.active,
+            'current': game.current_player.name if game.active else None,
+            'players': [{'name': p.name, 'position': p.position % len(game.board.spaces), 'balance': p.balance,
+                         'alive': game.is_alive(p)} for p in game.roster],
+        }
+
+    # Rola os dados; se a casa de destino estiver à venda, o turno espera a decisão de compra
+    def roll(self):
+        if not self.game.active:
+            raise ProtocolError("A partida já terminou.")
+        if self.pending is not None:
+            raise ProtocolError("Aguardando a decisão de compra.")
+        game = self.game
+        player = game.start_turn()
+        dice_values = game.roll_dice()
+        space = game.board.get_space(player.position + sum(dice_values))
+        if getattr(space, 'owner', False) is None:
+            self.pending = (player, dice_values)
+            return {'dice': dice_values, 'offer': {'space': space.name, 'price': space.price,
+                                                   'balance': player.balance}}
+        game.play_turn(player, dice_values)
+        return {'dice': dice_values}
+
+    def purchase(self, buy: bool):
+        if self.pending is None:
+            raise ProtocolError("Não há compra pendente.")
+        player, dice_values = self.pending
+        self.pending = None
+        self.decision = bool(buy)
+        owned = len(player.properties)
+        self.game.play_turn(player, dice_values)
+        return {'bought': len(player.properties) > owned}
+
+class GameServer:
+    def __init__(self, queue_size: int = QUEUE_SIZE):
+        self.sessions = {}
+        self.ids = itertools.count(1)
+        self.queue_size = queue_size
+        self.connections = 0
+        self.disconnected_slow = 0
+
+    def create_session(self, names, seed=None, balance: int = 500, owner: Connection = None):
+        if not isinstance(names, list) or not all(isinstance(name, str) for name in names):
+            raise ProtocolError("players deve ser uma lista de nomes.")
+        if len(names) < 2:
+            raise ProtocolError("São necessários ao menos dois jogadores.")
+        if seed is not None and not is_int(seed):
+            raise ProtocolError("seed deve ser um inteiro.")
+        if not is_int(balance):
+            raise ProtocolError("balance deve ser um inteiro.")
+        game = Game(build_default_board(), [Player(name, balance) for name in names], seed=seed)
+        session = Session(next(self.ids), game, owner)
+        self.sessions[session.id] = session
+        return session
+
+    def session(self, message):
+        session_id = message.get('session')
+        if not is_int(session_id):
+            raise ProtocolError("session deve ser um inteiro.")
+        session = self.sessions.get(session_id)
+        if session is None:
+            raise ProtocolError("Sessão inexistente.")
+        return session
+
+    # Sessão em que a conexão pode jogar: só a criadora joga e encerra
+    def owned_session(self, connection: Connection, message):
+        session = self.session(message)
+        if session.owner is not connection:
+            raise ProtocolError("Apenas a conexão que criou a sessão pode jogar ou encerrá-la.")
+        return session
+
+    def close_session(self, session):
+        self.sessions.pop(session.id, None)
+        for connection in session.subscribers:
+            connection.sessions.discard(session)
+        session.subscribers.clear()
+
+    def handle(self, connection: Connection, message: dict):
+        op = message.get('op')
+        if op == 'create':
+            session = self.create_session(message.get('players'), message.get('seed'), message.get('balance', 500),
+                                          connection)
+            connection.owned.add(session)
+            if message.get('watch', True):
+                session.subscribers.add(connection)
+                connection.sessions.add(session)
+            return session.state()
+        if op == 'roll':
+            return self.owned_session(connection, message).roll()
+        if op == 'purchase':
+            buy = message.get('buy', False)
+            if not isinstance(buy, bool):
+                raise ProtocolError("buy deve ser true ou false.")
+            return self.owned_session(connection, message).purchase(buy)
+        if op == 'state':
+            return self.session(message).state()
+        if op == 'watch':
+            session = self.session(message)
+            session.subscribers.add(connection)
+            connection.sessions.add(session)
+            return session.state()
+        if op == 'unwatch':
+            session = self.session(message)
+            session.subscribers.discard(connection)
+            connection.sessions.discard(session)
+            return {}
+        if op == 'close':
+            session = self.owned_session(connection, message)
+            connection.owned.discard(session)
+            self.close_session(session)
+            return {}
+        raise ProtocolError(f"Operação desconhecida: {op}.")
+
+    async def serve_client(self, reader, writer):
+        connection = Connection(writer, self.queue_size)
+        self.connections += 1
+        pump = asyncio.ensure_future(connection.pump())
+        try:
+            while not connection.closed:
+                line = await reader.readline()
+                if not line:
+                    break
+                request_id = None
+                try:
+                    message = json.loads(line)
+                    if not isinstance(message, dict):
+                        raise ProtocolError("A mensagem deve ser um objeto JSON.")
+                    request_id = message.get('id')
+                    reply = self.handle(connection, message)
+                    reply.update(type='reply', id=request_id)
+                except (ProtocolError, UnicodeDecodeError, json.JSONDecodeError) as error:
+                    reply = {'type': 'error', 'id': request_id, 'message': str(error)}
+                connection.send(encode(reply))
+                if connection.queue.qsize() * 2 > connection.queue.maxsize:
+                    await asyncio.sleep(0)  # Pedidos em rajada: deixa a fila ser escoada antes de ler o próximo
+        except ConnectionError:
+            pass
+        finally:
+            if connection.overflowed:
+                self.disconnected_slow += 1
+            for session in connection.sessions:
+                session.subscribers.discard(connection)
+            for session in connection.owned:
+                self.close_session(session)
+            self.connections -= 1
+            connection.close()
+            pump.cancel()
+
+async def serve(host: str, port: int, queue_size: int = QUEUE_SIZE):
+    game_server = GameServer(queue_size)
+    server = await asyncio.start_server(game_server.serve_client, host, port, limit=1 << 16)
+    async with server:
+        print(f"Servidor em {host}:{port}")
+        await server.serve_forever()
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor de partidas simultâneas (JSON por linha sobre TCP).")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--queue-size", type=int, default=QUEUE_SIZE, help="mensagens pendentes por cliente")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.queue_size))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+# ====================================
+# Simulação sem interface (headless)
+# ====================================
+# Executa partidas completas sem Tkinter: os dados vêm do gerador com semente
+# de cada Game e as decisões de compra vêm de políticas plugáveis (PurchasePolicy).
+
+import argparse
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from app import AlwaysBuyPolicy, Game, Player, build_default_board
+
+GameResult = namedtuple("GameResult", ["winner", "turns", "balances"])
+
+# Semente de cada partida derivada da semente do lote, independente do número de processos
+def game_seed(seed: int, game_index: int):
+    return (seed << 32) ^ game_index
+
+def make_players(num_players: int, balance: int = 500):
+    return [Player(f"Jogador {i + 1}", balance) for i in range(num_players)]
+
+class HeadlessRunner:
+    def __init__(self, game: Game, policies=None, max_turns: int = 1000):
+        self.game = game
+        self.max_turns = max_turns
+        self.turns = 0
+        self.default_policy = AlwaysBuyPolicy()
+        # Política por nome de jogador; jogadores sem política usam a padrão
+        self.policies = {}
+        for player, policy in zip(game.roster, policies or []):
+            self.policies[player.name] = policy
+        game.purchase_callback = self.decide_purchase
+
+    def decide_purchase(self, player: Player, space):
+        policy = self.policies.get(player.name, self.default_policy)
+        return policy.should_buy(player, space, self.game)
+
+    def play_turn(self):
+        player = self.game.start_turn()
+        self.game.play_turn(player, self.game.roll_dice())
+        self.turns += 1
+
+    def run(self):
+        while self.game.active and self.turns < self.max_turns:
+            self.play_turn()
+        winner = self.game.winner.name if not self.game.active else None
+        return GameResult(winner, self.turns, {p.name: p.balance for p in self.game.players})
+
+def play_game(seed: int, num_players: int = 2, policies=None, max_turns: int = 1000, board_factory=build_default_board):
+    game = Game(board_factory(), make_players(num_players), seed=seed)
+    return HeadlessRunner(game, policies, max_turns).run()
+
+# Mesma partida pelo motor de tabelas pré-compiladas (payoff.py), com a política padrão
+def play_compiled(tables, seed: int, num_players: int = 2, max_turns: int = 1000, starting_bonus: int = 100):
+    from payoff import TableEngine
+    players = make_players(num_players)
+    engine = TableEngine(tables, [p.balance for p in players], starting_bonus, seed).run(max_turns)
+    winner = players[engine.winner].name if engine.winner is not None else None
+    return GameResult(winner, engine.turns, {players[i].name: engine.balance[i] for i in engine.players})
+
+# Executado em cada processo: joga um bloco de partidas e devolve apenas os agregados
+def run_chunk(seed: int, start: int, count: int, num_players: int, policies, max_turns: int, board_factory,
+              engine: str = 'objetos'):
+    names = [f"Jogador {i + 1}" for i in range(num_players)]
+    wins = dict.fromkeys(names, 0)
+    lengths = []
+    unfinished = 0
+    tables = None
+    if engine == 'tabelas':
+        if policies:
+            raise ValueError("O motor de tabelas só suporta a política padrão (sempre compra).")
+        from payoff import compile_tables
+        tables = compile_tables(board_factory())
+    for game_index in range(start, start + count):
+        if tables is not None:
+            result = play_compiled(tables, game_seed(seed, game_index), num_players, max_turns)
+        else:
+            result = play_game(game_seed(seed, game_index), num_players, policies, max_turns, board_factory)
+        if result.winner is None:
+            unfinished += 1
+        else:
+            wins[result.winner] += 1
+        lengths.append(result.turns)
+    return wins, lengths, unfinished
+
+def run_batch(num_games: int, workers: int = None, seed: int = 0, num_players: int = 2, policies=None,
+              max_turns: int = 1000, board_factory=build_default_board, chunk_size: int = 250, engine: str = 'objetos'):
+    workers = workers or os.cpu_count() or 1
+    chunks = [(start, min(chunk_size, num_games - start)) for start in range(0, num_games, chunk_size)]
+    started = time.perf_counter()
+    wins = {}
+    lengths = []
+    unfinished = 0
+    if workers == 1:
+        partials = [run_chunk(seed, start, count, num_players, policies, max_turns, board_factory, engine)
+                    for start, count in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(run_chunk, seed, start, count, num_players, policies, max_turns, board_factory, engine)
+                       for start, count in chunks]
+            partials = [future.result() for future in futures]
+    for chunk_wins, chunk_lengths, chunk_unfinished in partials:
+        for name, count in chunk_wins.items():
+            wins[name] = wins.get(name, 0) + count
+        lengths.extend(chunk_lengths)
+        unfinished += chunk_unfinished
+    elapsed = time.perf_counter() - started
+    return {
+        'games': num_games,
+        'wins': wins,
+        'unfinished': unfinished,
+        'mean_turns': sum(lengths) / len(lengths) if lengths else 0.0,
+        'lengths': lengths,
+        'elapsed': elapsed,
+        'games_per_second': num_games / elapsed if elapsed > 0 else float('inf'),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulação em lote do jogo de tabuleiro, sem interface gráfica.")
+    parser.add_argument("--games", type=int, default=10000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--players", type=int, default=2)
+    parser.add_argument("--max-turns", type=int, default=1000)
+    parser.add_argument("--engine", choices=("objetos", "tabelas"), default="objetos",
+                        help="motor de regras: objetos (Game) ou tabelas pré-compiladas")
+    args = parser.parse_args()
+    summary = run_batch(args.games, args.workers, args.seed, args.players, max_turns=args.max_turns,
+                        engine=args.engine)
+    print(f"Partidas: {summary['games']} em {summary['elapsed']:.2f}s ({summary['games_per_second']:.0f} partidas/s)")
+    for name, count in sorted(summary['wins'].items()):
+        print(f"{name}: {count} vitórias")
+    print(f"Sem vencedor após {args.max_turns} turnos: {summary['unfinished']}")
+    print(f"Média de turnos: {summary['mean_turns']:.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+# ====================================
+# Estado compacto e imutável da partida, para busca e análises "e se"
+# ====================================
+# O GameState guarda apenas tuplas de inteiros (posições, saldos, donos das
+# casas, posses de cada jogador e a ordem dos vivos) e compartilha as tabelas
+# pré-compiladas do tabuleiro (payoff.py). apply devolve um novo estado sem
+# alterar o anterior, então bifurcar é gratuito e desfazer é voltar ao pai.
+# Não há observers: nada é notificado. A conversão usa Game.snapshot/restore,
+# o que torna a ida e volta com o Game sem perdas (inclusive o gerador).
+
+import random
+import time
+import weakref
+from bisect import bisect_right
+
+from payoff import OP_BONUS, OP_FIXED_FEE, OP_MOVE, OP_PENALTY, OP_PROPERTY, OP_VARIABLE_FEE, compile_tables
+
+_tables = weakref.WeakKeyDictionary()  # Tabuleiro -> tabelas compiladas
+
+def tables_for(board):
+    tables = _tables.get(board)
+    if tables is None:
+        tables = _tables[board] = compile_tables(board)
+    return tables
+
+class GameState:
+    __slots__ = ('tables', 'starting_bonus', 'position', 'balance', 'owner', 'holdings', 'alive', 'current',
+                 'active', 'rng_state', 'parent')
+
+    def __init__(self, tables, starting_bonus, position, balance, owner, holdings, alive, current, active,
+                 rng_state=None, parent=None):
+        self.tables = tables
+        self.starting_bonus = starting_bonus
+        self.position = position  # Posição absoluta de cada jogador (ordem de Game.roster)
+        self.balance = balance
+        self.owner = owner  # Dono de cada casa (índice no roster) ou -1
+        self.holdings = holdings  # Casas de cada jogador, na ordem de compra
+        self.alive = alive  # Jogadores vivos em ordem crescente, como TurnOrder.members
+        self.current = current  # Jogador da vez (índice no roster), como TurnOrder.current
+        self.active = active
+        self.rng_state = rng_state  # Estado do gerador do Game; não muda com apply
+        self.parent = parent
+
+    @classmethod
+    def from_game(cls, game):
+        current, active, alive, players, owner, rng_state = game.snapshot()
+        return cls(tables_for(game.board), game.starting_bonus, tuple(p[0] for p in players),
+                   tuple(p[1] for p in players), owner, tuple(p[2] for p in players), alive, current, active,
+                   rng_state)
+
+    def snapshot(self):
+        players = tuple(zip(self.position, self.balance, self.holdings))
+        return (self.current, self.active, self.alive, players, self.owner, self.rng_state)
+
+    # Grava o estado no Game (que deve ter um tabuleiro igual e os mesmos jogadores)
+    def to_game(self, game):
+        if len(game.board.spaces) != self.tables.num_spaces or len(game.roster) != len(self.position):
+            raise ValueError("O estado não corresponde a este jogo.")
+        game.restore(self.snapshot())
+        return game
+
+    def __eq__(self, other):
+        return isinstance(other, GameState) and self.snapshot() == other.snapshot()
+
+    def __hash__(self):
+        return hash(self.snapshot()[:5])
+
+    @property
+    def current_player(self):
+        return self.current
+
+    # Próximo vivo depois do jogador, na ordem circular do roster (como TurnOrder.after)
+    def successor(self, alive, player: int):
+        k = bisect_right(alive, player)
+        return alive[k] if k < len(alive) else alive[0]
+
+    def landing(self, total: int):
+        return (self.position[self.current_player] + total) % self.tables.num_spaces
+
+    # Se a soma dos dados levar a uma casa à venda, o jogador terá de decidir a compra
+    def offers_purchase(self, total: int):
+        space = self.landing(total)
+        op = self.tables.opcode[space]
+        return (op == OP_PROPERTY or op == OP_FIXED_FEE or op == OP_VARIABLE_FEE) and self.owner[space] < 0
+
+    def fork(self):
+        return self  # Imutável: o mesmo objeto serve como ramo independente
+
+    def undo(self):
+        if self.parent is None:
+            raise ValueError("Não há jogada para desfazer.")
+        return self.parent
+
+    # Resolve um turno com os dados dados, como Game.play_turn; buy é a decisão de compra se houver oferta
+    def apply(self, dice_values, buy: bool = True):
+        if not self.active:
+            raise ValueError("A partida já terminou.")
+        tables = self.tables
+        total = dice_values[0] + dice_values[1]
+        alive, owner, holdings, active = self.alive, self.owner, self.holdings, True
+        player = self.current
+        position = list(self.position)
+        balance = list(self.balance)
+        num_spaces = tables.num_spaces
+        prev = position[player]
+        new = prev + total
+        position[player] = new
+        if new // num_spaces > prev // num_spaces:
+            balance[player] += self.starting_bonus
+        space = new % num_spaces
+        op = tables.opcode[space]
+        eliminated = False
+        if op == OP_PROPERTY or op == OP_FIXED_FEE or op == OP_VARIABLE_FEE:
+            holder = owner[space]
+            if holder < 0:
+                if buy and balance[player] >= tables.price[space]:
+                    balance[player] -= tables.price[space]
+                    owner = owner[:space] + (player,) + owner[space + 1:]
+                    holdings = holdings[:player] + (holdings[player] + (space,),) + holdings[player + 1:]
+            elif holder != player:
+                amount = tables.payoff[space][total]
+                if balance[player] >= amount:
+                    balance[player] -= amount
+                    balance[holder] += amount
+                else:
+                    eliminated = True
+        elif op == OP_MOVE:
+            position[player] += tables.jump[space]
+        elif op == OP_BONUS:
+            balance[player] += tables.payoff[space][total]
+        elif op == OP_PENALTY:
+            balance[player] -= tables.payoff[space][total]
+            eliminated = balance[player] < 0
+        if eliminated:  # Game.eliminate_player: sai da ordem e devolve as casas ao banco
+            alive = tuple(p for p in alive if p != player)
+            if holdings[player]:
+                released = set(holdings[player])
+                owner = tuple(-1 if i in released else o for i, o in enumerate(owner))
+                holdings = holdings[:player] + ((),) + holdings[player + 1:]
+            active = len(alive) != 1
+        current = self.successor(alive, player) if active else player
+        return GameState(tables, self.starting_bonus, tuple(position), tuple(balance), owner, holdings, alive,
+                         current, active, self.rng_state, self)
+
+    # Conclui um turno interrompido na oferta de compra (Game.offer_purchase), com o jogador já na casa
+    def resolve_purchase(self, space: int, buy: bool):
+        player = self.current_player
+        balance, owner, holdings = self.balance, self.owner, self.holdings
+        price = self.tables.price[space]
+        if buy and owner[space] < 0 and balance[player] >= price:
+            balance = balance[:player] + (balance[player] - price,) + balance[player + 1:]
+            owner = owner[:space] + (player,) + owner[space + 1:]
+            holdings = holdings[:player] + (holdings[player] + (space,),) + holdings[player + 1:]
+        return GameState(self.tables, self.starting_bonus, self.position, balance, owner, holdings, self.alive,
+                         self.successor(self.alive, player), self.active, self.rng_state, self)
+
+    # Turno com os dados do próprio gerador do jogo (mesma sequência do Game.roll_dice)
+    def step(self, buy: bool = True):
+        rng = random.Random()
+        rng.setstate(self.rng_state)
+        dice_values = [rng.randint(1, 6), rng.randint(1, 6)]
+        child = self.apply(dice_values, buy)
+        child.rng_state = rng.getstate()
+        return child
+
+# Joga partidas no Game e no GameState lado a lado e confere o estado a cada turno
+def verify(num_games: int = 200, seed: int = 0, num_players: int = 3, max_turns: int = 300):
+    from app import Game, build_default_board
+    from simulation import game_seed, make_players
+    mismatches = 0
+    for game_index in range(num_games):
+        game = Game(build_default_board(), make_players(num_players), seed=game_seed(seed, game_index))
+        decisions = random.Random(game_index)
+        state = GameState.from_game(game)
+        for _ in range(max_turns):
+            if not game.active:
+                break
+            buy = decisions.random() < 0.7
+            game.purchase_callback = lambda player, space: buy
+            state = state.step(buy)
+            game.play_turn(game.start_turn(), game.roll_dice())
+            if GameState.from_game(game) != state:
+                mismatches += 1
+                break
+        # Ida e volta: o estado gravado em um Game novo é lido de volta igual
+        copy = Game(build_default_board(), make_players(num_players), seed=0)
+        if GameState.from_game(state.to_game(copy)) != state:
+            mismatches += 1
+    return mismatches
+
+def main():
+    from app import Game, build_default_board
+    from simulation import make_players
+    mismatches = verify()
+    print(f"Partidas divergentes do Game: {mismatches}")
+
+    state = GameState.from_game(Game(build_default_board(), make_players(4), seed=1))
+    dice = [(d1, d2) for d1 in range(1, 7) for d2 in range(1, 7)]
+    count = 0
+    started = time.perf_counter()
+    while count < 200000:
+        for dice_values in dice:
+            child = state.fork().apply(dice_values)
+            child.undo()
+            count += 1
+    elapsed = time.perf_counter() - started
+    print(f"fork + apply + undo: {elapsed / count * 1e6:.2f} µs")
+    raise SystemExit(1 if mismatches else 0)
+
+if __name__ == "__main__":
+    main()
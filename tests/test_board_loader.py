@@ -0,0 +1,41 @@
+import pytest
+
+from app import EFFECTS, FEE_STRATEGIES, Board, Company, Property, SpecialPlace, build_default_board, move_effect
+from board_loader import ArrayBoard, load_board, save_board, space_to_record
+from payoff import compile_tables
+
+FORMATS = ('json', 'jsonl', 'csv', 'cols')
+
+# Todas as estratégias de taxa e todos os efeitos registrados, com nomes que exigem escape no CSV e no JSON
+def mixed_board():
+    spaces = [SpecialPlace("Ponto de Partida", EFFECTS['none'])]
+    for i, (name, effect) in enumerate(EFFECTS.items()):
+        spaces.append(SpecialPlace(f"Especial {name}", effect))
+        spaces.append(Property(f"Rua \"{i}\", Nº {i}", 100 + i, 10 + i))
+    for i, strategy in enumerate(FEE_STRATEGIES.values()):
+        spaces.append(Company(f"Empresa {i} — ação", 150 + i, 5 + i, strategy))
+    for steps in (1, 3, -2):
+        spaces.append(SpecialPlace(f"Avanço {steps}", move_effect(steps)))
+    return Board(spaces)
+
+@pytest.mark.parametrize("board_factory", [build_default_board, mixed_board])
+@pytest.mark.parametrize("extension", FORMATS)
+def test_round_trip_keeps_records_and_tables(tmp_path, extension, board_factory):
+    board = board_factory()
+    path = str(tmp_path / f"tabuleiro.{extension}")
+    save_board(board, path)
+    loaded = load_board(path)
+    assert [space_to_record(s) for s in loaded.spaces] == [space_to_record(s) for s in board.spaces]
+    assert vars(compile_tables(loaded)) == vars(compile_tables(board))
+    assert [s.index for s in loaded.spaces] == list(range(len(board.spaces)))
+    assert loaded.kind_totals() == board.kind_totals()
+
+def test_columnar_board_builds_spaces_on_access(tmp_path):
+    path = str(tmp_path / "tabuleiro.cols")
+    save_board(build_default_board(1000), path)
+    board = load_board(path)
+    assert isinstance(board, ArrayBoard)
+    assert board.spaces.built.count(None) == 1000
+    space = board.get_space(1003)
+    assert space is board.spaces[3] and space.index == 3
+    assert board.spaces.built.count(None) == 999
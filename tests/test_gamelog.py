@@ -0,0 +1,42 @@
+import random
+
+import pytest
+
+from app import Game, build_default_board
+from gamelog import GameLog, GameRecorder, GameReplayer
+from simulation import make_players
+
+CHECKPOINTS = (1, 100, 257, 5000, 9999)
+
+# Joga com compras aleatórias gravando o log; devolve os snapshots do jogo ao vivo nos pontos de verificação
+def record_game(path, seed, num_turns=10000, num_players=3):
+    game = Game(build_default_board(), make_players(num_players), seed=seed)
+    buys = random.Random(seed)
+    game.purchase_callback = lambda player, space: buys.random() < 0.5
+    recorder = GameRecorder(game, path)
+    snapshots = {}
+    for turn in range(1, num_turns + 1):
+        game.play_turn(game.start_turn(), game.roll_dice())
+        if turn in CHECKPOINTS:
+            snapshots[turn] = game.snapshot()
+    recorder.close()
+    assert game.active  # A semente escolhida não termina antes do último ponto de verificação
+    return snapshots
+
+def test_replay_matches_live_game_at_any_turn(tmp_path):
+    path = str(tmp_path / "partida.jtlg")
+    snapshots = record_game(path, seed=0)
+    replayer = GameReplayer(GameLog.read(path))
+    assert replayer.num_turns == 10000
+    for turn in CHECKPOINTS:
+        assert replayer.game_at(turn).snapshot() == snapshots[turn]
+
+def test_negative_seed_replays_same_dice(tmp_path):
+    path = str(tmp_path / "partida.jtlg")
+    snapshots = record_game(path, seed=-7, num_turns=300)
+    assert GameReplayer(GameLog.read(path)).game_at(257).snapshot() == snapshots[257]
+
+def test_seed_wider_than_log_is_rejected(tmp_path):
+    game = Game(build_default_board(), make_players(2), seed=1 << 64)
+    with pytest.raises(ValueError):
+        GameRecorder(game, str(tmp_path / "partida.jtlg"))
@@ -0,0 +1,19 @@
+import random
+
+import pytest
+
+from payoff import verify
+
+# O TableEngine sorteia os dados com getrandbits(3) e rejeição, copiando o randint do CPython;
+# se uma versão do Python mudar esse algoritmo, este teste aponta antes das partidas divergirem
+def test_dice_shortcut_matches_randint():
+    expected, actual = random.Random(7), random.Random(7)
+    for _ in range(10000):
+        value = actual.getrandbits(3)
+        while value >= 6:
+            value = actual.getrandbits(3)
+        assert value + 1 == expected.randint(1, 6)
+
+@pytest.mark.parametrize("num_players", [2, 3, 4])
+def test_table_engine_matches_game(num_players):
+    assert verify(num_games=150, seed=0, num_players=num_players, max_turns=400) == []
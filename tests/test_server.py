@@ -0,0 +1,36 @@
+import pytest
+
+from server import Connection, GameServer, ProtocolError
+
+class FakeWriter:
+    def close(self):
+        pass
+
+def create(server, connection):
+    return server.handle(connection, {'op': 'create', 'players': ["Ana", "Bia"], 'seed': 7})['session']
+
+@pytest.mark.parametrize("message", [{'op': 'roll'}, {'op': 'purchase', 'buy': True}, {'op': 'close'}])
+def test_only_creator_plays_or_closes_session(message):
+    server = GameServer()
+    creator, other = Connection(FakeWriter()), Connection(FakeWriter())
+    session_id = create(server, creator)
+    with pytest.raises(ProtocolError):
+        server.handle(other, {**message, 'session': session_id})
+    assert session_id in server.sessions
+    assert server.handle(other, {'op': 'watch', 'session': session_id})['session'] == session_id
+    assert 'dice' in server.handle(creator, {'op': 'roll', 'session': session_id})
+    server.handle(creator, {'op': 'close', 'session': session_id})
+    assert session_id not in server.sessions and not creator.owned
+
+@pytest.mark.parametrize("message", [
+    {'op': 'roll', 'session': [1]},
+    {'op': 'state', 'session': "1"},
+    {'op': 'purchase', 'session': 1, 'buy': "sim"},
+    {'op': 'create', 'players': "Ana"},
+    {'op': 'create', 'players': ["Ana", "Bia"], 'seed': True},
+])
+def test_invalid_fields_are_protocol_errors(message):
+    server = GameServer()
+    create(server, Connection(FakeWriter()))
+    with pytest.raises(ProtocolError):
+        server.handle(Connection(FakeWriter()), message)
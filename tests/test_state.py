@@ -0,0 +1,16 @@
+import pytest
+
+from app import Game, build_default_board
+from simulation import make_players
+from state import GameState, verify
+
+@pytest.mark.parametrize("num_players", [2, 3])
+def test_game_state_matches_game(num_players):
+    assert verify(num_games=60, seed=0, num_players=num_players, max_turns=300) == 0
+
+def test_apply_does_not_change_parent():
+    state = GameState.from_game(Game(build_default_board(), make_players(3), seed=1))
+    before = state.snapshot()
+    child = state.fork().apply((3, 4))
+    assert state.snapshot() == before
+    assert child.undo() is state
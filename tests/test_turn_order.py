@@ -0,0 +1,74 @@
+import pytest
+
+from app import Game, NeverBuyPolicy, build_default_board
+from events import Won
+from simulation import make_players
+
+RENT_SPACE = 3  # "Rua 3" no tabuleiro padrão
+
+def make_game(num_players):
+    game = Game(build_default_board(), make_players(num_players), seed=0)
+    game.purchase_callback = lambda player, space: NeverBuyPolicy().should_buy(player, space, game)
+    return game
+
+# Leva o jogador da vez até a casa alugada por owner, sem saldo para pagar o aluguel
+def bankrupt_current(game, owner):
+    player = game.current_player
+    game.ownership.acquire(owner, game.board.spaces[RENT_SPACE])
+    player.position, player.balance = 0, 0
+    game.play_turn(game.start_turn(), [1, 2])
+    return player
+
+def turn_sequence(game, count):
+    order = game.turn_order
+    return [game.roster[order.advance()].name for _ in range(count)]
+
+@pytest.mark.parametrize("num_players", [3, 4])
+def test_eliminating_current_player_passes_turn_to_next_alive(num_players):
+    game = make_game(num_players)
+    roster = game.roster
+    game.turn_order.advance()  # Vez do Jogador 2
+    eliminated = bankrupt_current(game, roster[-1])
+    assert eliminated is roster[1]
+    assert not game.is_alive(eliminated)
+    assert game.current_player is roster[2]
+    assert game.players == [p for p in roster if p is not eliminated]
+
+def test_eliminating_other_player_keeps_turn_order():
+    game = make_game(4)
+    roster = game.roster
+    game.eliminate_player(roster[2])
+    assert game.current_player is roster[0]
+    assert turn_sequence(game, 4) == ["Jogador 2", "Jogador 4", "Jogador 1", "Jogador 2"]
+
+def test_eliminating_next_players_skips_all_of_them():
+    game = make_game(4)
+    roster = game.roster
+    game.eliminate_player(roster[1])
+    game.eliminate_player(roster[2])
+    assert turn_sequence(game, 3) == ["Jogador 4", "Jogador 1", "Jogador 4"]
+
+def test_snapshot_restore_with_eliminated_current_player():
+    game = make_game(4)
+    roster = game.roster
+    game.turn_order.advance()  # Vez do Jogador 2
+    game.eliminate_player(roster[1])  # Eliminado no próprio turno, antes de passar a vez
+    snapshot = game.snapshot()
+    restored = make_game(4)
+    restored.restore(snapshot)
+    assert restored.snapshot() == snapshot
+    assert not restored.is_alive(restored.roster[1])
+    assert turn_sequence(restored, 4) == turn_sequence(game, 4) == ["Jogador 3", "Jogador 4", "Jogador 1",
+                                                                    "Jogador 3"]
+
+def test_winner_is_last_player_alive():
+    game = make_game(3)
+    roster = game.roster
+    winners = []
+    game.add_sink(lambda event: winners.append(event.player), [Won])
+    game.eliminate_player(roster[1])
+    assert game.winner is None and game.active
+    bankrupt_current(game, roster[2])  # Jogador 1 perde no próprio turno
+    assert not game.active
+    assert game.winner is roster[2]
+    assert winners == [roster[2]]
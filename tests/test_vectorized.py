@@ -0,0 +1,11 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from vectorized import compare_with_scalar
+
+# Sementes fixas: o resultado é determinístico, o limite de z só separa regra divergente de ruído
+@pytest.mark.parametrize("num_players", [2, 3])
+def test_vectorized_matches_scalar_engine(num_players):
+    result = compare_with_scalar(num_games=400, seed=0, max_turns=300, num_players=num_players)
+    assert result['passed'], result['scores']
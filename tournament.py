@@ -0,0 +1,212 @@
+# ====================================
+# Torneio de políticas de compra (round-robin em paralelo)
+# ====================================
+# Cada par de políticas joga lotes de partidas com sementes independentes em um
+# pool de processos, alternando quem começa. Partidas que chegam ao limite de
+# turnos são decididas pelo patrimônio. Um teste sequencial (SPRT) encerra o
+# confronto assim que uma política se mostra melhor ou que as duas se mostram
+# equivalentes (empate); sem decisão até o limite de partidas, o confronto fica
+# inconclusivo.
+
+import argparse
+import itertools
+import math
+import os
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from advisor import ExpectimaxPolicy
+from app import (AlwaysBuyPolicy, CashReservePolicy, ExpectedValuePolicy, Game, NeverBuyPolicy, RandomBuyPolicy,
+                 ThresholdPolicy, build_default_board)
+from simulation import HeadlessRunner, game_seed, make_players
+
+# Nome -> fábrica da política; a semente é usada pelas políticas aleatórias
+POLICIES = {
+    'sempre': lambda seed: AlwaysBuyPolicy(),
+    'nunca': lambda seed: NeverBuyPolicy(),
+    'aleatoria_25': lambda seed: RandomBuyPolicy(0.25, random.Random(seed)),
+    'aleatoria_50': lambda seed: RandomBuyPolicy(0.5, random.Random(seed)),
+    'aleatoria_75': lambda seed: RandomBuyPolicy(0.75, random.Random(seed)),
+    'limite_25': lambda seed: ThresholdPolicy(0.25),
+    'limite_50': lambda seed: ThresholdPolicy(0.5),
+    'limite_75': lambda seed: ThresholdPolicy(0.75),
+    'limite_100': lambda seed: ThresholdPolicy(1.0),
+    'reserva_50': lambda seed: CashReservePolicy(50),
+    'reserva_100': lambda seed: CashReservePolicy(100),
+    'reserva_200': lambda seed: CashReservePolicy(200),
+    'reserva_300': lambda seed: CashReservePolicy(300),
+    'reserva_400': lambda seed: CashReservePolicy(400),
+    'valor_10': lambda seed: ExpectedValuePolicy(10),
+    'valor_25': lambda seed: ExpectedValuePolicy(25),
+    'valor_50': lambda seed: ExpectedValuePolicy(50),
+    'valor_100': lambda seed: ExpectedValuePolicy(100),
+    'valor_50_reserva_100': lambda seed: ExpectedValuePolicy(50, 100),
+    'valor_100_reserva_200': lambda seed: ExpectedValuePolicy(100, 200),
+    'expectimax_5ms': lambda seed: ExpectimaxPolicy(0.005),
+}
+
+# Vencedor de uma partida que chegou ao limite de turnos: maior patrimônio (None se iguais)
+def settle_by_net_worth(game: Game):
+    first, second = sorted(game.players, key=game.ownership.net_worth, reverse=True)[:2]
+    if game.ownership.net_worth(first) == game.ownership.net_worth(second):
+        return None
+    return first.name
+
+# Executado em cada processo: joga um lote do confronto e devolve
+# (vitórias de A, vitórias de B, empates de patrimônio, partidas decididas pelo patrimônio)
+def play_matchup_batch(name_a: str, name_b: str, seed: int, matchup: int, start: int, count: int, max_turns: int):
+    wins_a = wins_b = unfinished = settled = 0
+    for game_index in range(start, start + count):
+        game_seed_value = game_seed(seed, (matchup << 24) | game_index)
+        policy_a = POLICIES[name_a](game_seed_value)
+        policy_b = POLICIES[name_b](game_seed_value + 1)
+        # Alterna quem joga primeiro para anular a vantagem do primeiro jogador
+        a_first = game_index % 2 == 0
+        policies = [policy_a, policy_b] if a_first else [policy_b, policy_a]
+        game = Game(build_default_board(), make_players(2), seed=game_seed_value)
+        winner = HeadlessRunner(game, policies, max_turns).run().winner
+        if winner is None:
+            winner = settle_by_net_worth(game)
+            settled += winner is not None
+        if winner is None:
+            unfinished += 1
+        elif (winner == "Jogador 1") == a_first:
+            wins_a += 1
+        else:
+            wins_b += 1
+    return wins_a, wins_b, unfinished, settled
+
+# Dois SPRTs unilaterais sobre as partidas decididas: H0 p(A vence) = 0.5 contra p = 0.5 + delta
+# (A melhor) e contra p = 0.5 - delta (B melhor). Se os dois aceitam H0, o confronto é um empate.
+class SequentialTest:
+    DRAW = 'empate'
+    INCONCLUSIVE = 'inconclusivo'  # Limite de partidas atingido sem decisão do teste
+
+    def __init__(self, delta: float = 0.05, alpha: float = 0.05, beta: float = 0.05):
+        self.up = math.log((0.5 + delta) / 0.5)  # Contribuição de uma vitória do lado testado
+        self.down = math.log((0.5 - delta) / 0.5)  # Contribuição de uma derrota
+        self.upper = math.log((1 - beta) / alpha)
+        self.lower = math.log(beta / (1 - alpha))
+
+    def decide(self, wins_a: int, wins_b: int):
+        llr_a = wins_a * self.up + wins_b * self.down
+        llr_b = wins_b * self.up + wins_a * self.down
+        if llr_a >= self.upper:
+            return 'A'
+        if llr_b >= self.upper:
+            return 'B'
+        if llr_a <= self.lower and llr_b <= self.lower:
+            return self.DRAW
+        return None
+
+class Matchup:
+    def __init__(self, index: int, name_a: str, name_b: str):
+        self.index = index
+        self.name_a = name_a
+        self.name_b = name_b
+        self.wins_a = self.wins_b = self.unfinished = 0
+        self.settled = 0  # Partidas no limite de turnos decididas pelo patrimônio (já contadas nas vitórias)
+        self.scheduled = 0  # Partidas já enviadas ao pool
+        self.winner = None
+        self.done = False
+
+    @property
+    def games(self):
+        return self.wins_a + self.wins_b + self.unfinished
+
+def run_tournament(names, seed: int = 0, workers: int = None, batch_size: int = 50, max_games: int = 2000,
+                   max_turns: int = 500, test: SequentialTest = None):
+    test = test or SequentialTest()
+    workers = workers or os.cpu_count() or 1
+    matchups = [Matchup(i, a, b) for i, (a, b) in enumerate(itertools.combinations(names, 2))]
+    pending = {}  # future -> matchup
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        def submit(matchup):
+            count = min(batch_size, max_games - matchup.scheduled)
+            future = pool.submit(play_matchup_batch, matchup.name_a, matchup.name_b, seed, matchup.index,
+                                 matchup.scheduled, count, max_turns)
+            matchup.scheduled += count
+            pending[future] = matchup
+
+        # Mantém o pool ocupado: um lote por confronto aberto, até 2 lotes por processo
+        queue = list(matchups)
+        while queue or pending:
+            while queue and len(pending) < 2 * workers:
+                matchup = queue.pop(0)
+                if not matchup.done and matchup.scheduled < max_games:
+                    submit(matchup)
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                matchup = pending.pop(future)
+                wins_a, wins_b, unfinished, settled = future.result()
+                matchup.wins_a += wins_a
+                matchup.wins_b += wins_b
+                matchup.unfinished += unfinished
+                matchup.settled += settled
+                if matchup.done:
+                    continue
+                matchup.winner = test.decide(matchup.wins_a, matchup.wins_b)
+                if matchup.winner:
+                    matchup.done = True
+                elif matchup.scheduled >= max_games:
+                    if matchup.scheduled == matchup.games:  # Espera o último lote antes de encerrar
+                        matchup.winner = test.INCONCLUSIVE
+                        matchup.done = True
+                else:
+                    queue.append(matchup)
+    return matchups
+
+# Vitória no confronto vale 1 ponto e empate aceito pelo teste 0,5; um confronto inconclusivo
+# divide o ponto pela fração de partidas decididas que cada lado venceu (0,5 se nenhuma)
+def rank(names, matchups):
+    points = dict.fromkeys(names, 0.0)
+    wins = dict.fromkeys(names, 0)
+    decided = dict.fromkeys(names, 0)
+    for m in matchups:
+        if m.winner == 'A':
+            points[m.name_a] += 1
+        elif m.winner == 'B':
+            points[m.name_b] += 1
+        elif m.winner == SequentialTest.INCONCLUSIVE and m.wins_a + m.wins_b:
+            points[m.name_a] += m.wins_a / (m.wins_a + m.wins_b)
+            points[m.name_b] += m.wins_b / (m.wins_a + m.wins_b)
+        else:
+            points[m.name_a] += 0.5
+            points[m.name_b] += 0.5
+        wins[m.name_a] += m.wins_a
+        wins[m.name_b] += m.wins_b
+        decided[m.name_a] += m.wins_a + m.wins_b
+        decided[m.name_b] += m.wins_a + m.wins_b
+    rate = {name: wins[name] / decided[name] if decided[name] else 0.0 for name in names}
+    return sorted(names, key=lambda name: (points[name], rate[name]), reverse=True), points, rate
+
+def main():
+    parser = argparse.ArgumentParser(description="Torneio round-robin entre políticas de compra.")
+    parser.add_argument("--policies", nargs="*", default=list(POLICIES), help=f"opções: {', '.join(POLICIES)}")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--max-games", type=int, default=2000, help="limite de partidas por confronto")
+    parser.add_argument("--max-turns", type=int, default=500)
+    parser.add_argument("--delta", type=float, default=0.05, help="diferença mínima de taxa de vitória a detectar")
+    args = parser.parse_args()
+    unknown = [name for name in args.policies if name not in POLICIES]
+    if unknown:
+        parser.error(f"políticas desconhecidas: {', '.join(unknown)}")
+
+    started = time.perf_counter()
+    matchups = run_tournament(args.policies, args.seed, args.workers, args.batch_size, args.max_games,
+                              args.max_turns, SequentialTest(args.delta))
+    elapsed = time.perf_counter() - started
+    ranking, points, rate = rank(args.policies, matchups)
+    total_games = sum(m.games for m in matchups)
+    settled = sum(m.settled for m in matchups)
+    inconclusive = sum(m.winner == SequentialTest.INCONCLUSIVE for m in matchups)
+    print(f"{len(matchups)} confrontos, {total_games} partidas em {elapsed:.1f}s "
+          f"({settled} decididas pelo patrimônio, {inconclusive} confrontos inconclusivos)")
+    for position, name in enumerate(ranking, start=1):
+        print(f"{position:>2}. {name:<24} pontos: {points[name]:>5.1f}  vitórias: {rate[name]:.1%}")
+
+if __name__ == "__main__":
+    main()
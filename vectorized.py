@@ -0,0 +1,196 @@
+# ====================================
+# Simulação vetorizada (NumPy) – milhões de partidas em passo único
+# ====================================
+# As N partidas são guardadas como estrutura de arrays (posições, saldos,
+# matriz de donos e máscara de jogadores vivos) e avançam um turno por vez
+# com os dados de todas as partidas sorteados de uma só vez.
+# Depende de NumPy.
+
+import argparse
+import math
+import time
+
+import numpy as np
+
+from app import BONUS_AMOUNT, PENALTY_AMOUNT, build_default_board
+from payoff import (OP_BONUS, OP_FIXED_FEE, OP_MOVE, OP_PENALTY, OP_PROPERTY, OP_VARIABLE_FEE,
+                    compile_tables)
+
+class BoardArrays:
+    def __init__(self, kind, price, fee, steps):
+        self.kind = kind
+        self.price = price
+        self.fee = fee  # Aluguel do imóvel ou taxa base da empresa
+        self.steps = steps
+        self.num_spaces = len(kind)
+
+# Mesmas tabelas do motor escalar por tabelas (payoff.py), convertidas em arrays
+def compile_board(board):
+    tables = compile_tables(board)
+    return BoardArrays(np.array(tables.opcode, np.int8), np.array(tables.price, np.int64),
+                       np.array(tables.fee, np.int64), np.array(tables.jump, np.int64))
+
+class VectorizedSimulator:
+    def __init__(self, board, num_games: int, num_players: int = 2, balance: int = 500, starting_bonus: int = 100,
+                 seed=None, buy_reserve: int = 0, max_turns: int = 1000):
+        self.tables = compile_board(board)
+        self.num_games = num_games
+        self.num_players = num_players
+        self.starting_bonus = starting_bonus
+        self.buy_reserve = buy_reserve  # Compra apenas se sobrar ao menos esse saldo (0 = sempre compra)
+        self.max_turns = max_turns
+        self.rng = np.random.default_rng(seed)
+        self.position = np.zeros((num_games, num_players), np.int64)  # Posição absoluta, conta as voltas
+        self.balance = np.full((num_games, num_players), balance, np.int64)
+        self.alive = np.ones((num_games, num_players), bool)
+        self.owner = np.full((num_games, self.tables.num_spaces), -1, np.int16)  # -1 = banco
+        self.current = np.zeros(num_games, np.int64)
+        self.active = np.ones(num_games, bool)
+        self.turns = np.zeros(num_games, np.int64)
+        self.winner = np.full(num_games, -1, np.int64)
+
+    def step(self):
+        games = np.flatnonzero(self.active)
+        if games.size == 0:
+            return 0
+        tables = self.tables
+        player = self.current[games]
+        dice = self.rng.integers(1, 7, size=(2, games.size))
+        total = dice[0] + dice[1]
+
+        # Movimento e bônus do Ponto de Partida
+        prev = self.position[games, player]
+        new = prev + total
+        self.position[games, player] = new
+        balance = self.balance[games, player]
+        balance += np.where(new // tables.num_spaces > prev // tables.num_spaces, self.starting_bonus, 0)
+
+        space = new % tables.num_spaces
+        kind = tables.kind[space]
+        fee = tables.fee[space]
+        owner = self.owner[games, space].astype(np.int64)
+        purchasable = (kind == OP_PROPERTY) | (kind == OP_FIXED_FEE) | (kind == OP_VARIABLE_FEE)
+
+        # Compra (Game.offer_purchase)
+        price = tables.price[space]
+        buy = purchasable & (owner < 0) & (balance >= price + self.buy_reserve)
+        balance -= np.where(buy, price, 0)
+        self.owner[games[buy], space[buy]] = player[buy]
+
+        # Aluguel do imóvel ou taxa da empresa (FixedFeeStrategy / VariableFeeStrategy)
+        charged = purchasable & (owner >= 0) & (owner != player)
+        fee = np.where(kind == OP_VARIABLE_FEE, fee * total, fee)
+        pays = charged & (balance >= fee)
+        balance -= np.where(pays, fee, 0)
+        eliminated = charged & ~pays
+
+        # Lugares especiais
+        balance += np.where(kind == OP_BONUS, BONUS_AMOUNT, 0)
+        penalised = kind == OP_PENALTY
+        balance -= np.where(penalised, PENALTY_AMOUNT, 0)
+        eliminated |= penalised & (balance < 0)
+        moved = kind == OP_MOVE
+        self.position[games[moved], player[moved]] += tables.steps[space[moved]]
+
+        self.balance[games, player] = balance
+        self.balance[games[pays], owner[pays]] += fee[pays]
+        self.alive[games[eliminated], player[eliminated]] = False
+        # Os logradouros do jogador eliminado voltam ao banco
+        released = self.owner[games[eliminated]]
+        released[released == player[eliminated][:, None]] = -1
+        self.owner[games[eliminated]] = released
+        self.turns[games] += 1
+
+        # Fim de jogo: resta apenas um jogador
+        alive = self.alive[games]
+        finished = alive.sum(axis=1) <= 1
+        self.winner[games[finished]] = np.argmax(alive[finished], axis=1)
+        self.active[games[finished]] = False
+
+        # Próximo jogador vivo na ordem circular
+        running = ~finished
+        games, player, alive = games[running], player[running], alive[running]
+        candidates = (player[:, None] + np.arange(1, self.num_players + 1)) % self.num_players
+        first_alive = np.argmax(np.take_along_axis(alive, candidates, axis=1), axis=1)
+        self.current[games] = candidates[np.arange(games.size), first_alive]
+        self.active[games[self.turns[games] >= self.max_turns]] = False
+        return games.size
+
+    def run(self):
+        while self.step():
+            pass
+        return self.summary()
+
+    def summary(self):
+        wins = np.bincount(self.winner[self.winner >= 0], minlength=self.num_players)
+        return {
+            'games': self.num_games,
+            'wins': {f"Jogador {i + 1}": int(count) for i, count in enumerate(wins)},
+            'unfinished': int((self.winner < 0).sum()),
+            'mean_turns': float(self.turns.mean()) if self.num_games else 0.0,
+            'lengths': self.turns,
+        }
+
+# ====================================
+# Teste estatístico de equivalência com o motor escalar (Game)
+# ====================================
+
+def proportion_z(successes_a: int, total_a: int, successes_b: int, total_b: int):
+    pooled = (successes_a + successes_b) / (total_a + total_b)
+    se = math.sqrt(pooled * (1 - pooled) * (1 / total_a + 1 / total_b))
+    if se == 0:
+        return 0.0
+    return (successes_a / total_a - successes_b / total_b) / se
+
+def mean_z(values_a, values_b):
+    def moments(values):
+        n = len(values)
+        mean = sum(values) / n
+        variance = sum((v - mean) ** 2 for v in values) / (n - 1)
+        return n, mean, variance
+    n_a, mean_a, var_a = moments([int(v) for v in values_a])
+    n_b, mean_b, var_b = moments([int(v) for v in values_b])
+    se = math.sqrt(var_a / n_a + var_b / n_b)
+    if se == 0:
+        return 0.0
+    return (mean_a - mean_b) / se
+
+def compare_with_scalar(num_games: int = 2000, seed: int = 0, max_turns: int = 1000, z_limit: float = 4.0,
+                        num_players: int = 2):
+    from simulation import run_batch
+    scalar = run_batch(num_games, workers=1, seed=seed, num_players=num_players, max_turns=max_turns)
+    vector = VectorizedSimulator(build_default_board(), num_games, num_players, seed=seed, max_turns=max_turns).run()
+    scores = {
+        f"vitórias {name}": proportion_z(scalar['wins'][name], num_games, vector['wins'][name], num_games)
+        for name in scalar['wins']
+    }
+    scores['sem vencedor'] = proportion_z(scalar['unfinished'], num_games, vector['unfinished'], num_games)
+    scores['duração média'] = mean_z(scalar['lengths'], vector['lengths'])
+    return {'scores': scores, 'passed': all(abs(z) < z_limit for z in scores.values())}
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulação vetorizada de muitas partidas em paralelo.")
+    parser.add_argument("--games", type=int, default=1000000)
+    parser.add_argument("--players", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-turns", type=int, default=1000)
+    parser.add_argument("--check", action="store_true", help="compara estatisticamente com o motor escalar")
+    args = parser.parse_args()
+    if args.check:
+        result = compare_with_scalar(seed=args.seed, max_turns=args.max_turns, num_players=args.players)
+        for name, z in result['scores'].items():
+            print(f"{name}: z = {z:+.2f}")
+        print("Equivalente" if result['passed'] else "Divergente")
+        raise SystemExit(0 if result['passed'] else 1)
+    started = time.perf_counter()
+    summary = VectorizedSimulator(build_default_board(), args.games, args.players, seed=args.seed,
+                                  max_turns=args.max_turns).run()
+    elapsed = time.perf_counter() - started
+    print(f"Partidas: {summary['games']} em {elapsed:.2f}s ({summary['games'] / elapsed:.0f} partidas/s)")
+    for name, count in summary['wins'].items():
+        print(f"{name}: {count} vitórias")
+    print(f"Sem vencedor após {args.max_turns} turnos: {summary['unfinished']}")
+    print(f"Média de turnos: {summary['mean_turns']:.1f}")
+
+if __name__ == "__main__":
+    main()